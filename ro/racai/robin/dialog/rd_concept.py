@@ -45,6 +45,59 @@ class RDConcept:
         # To be filled in at the first request.
         self.assigned_reference_tokens = []
 
+        # The {@link ReferenceFeatures} of the {@link #assignedReferenceTokens},
+        # computed at the first request.
+        self.reference_features = None
+
+        # The id given to this concept when it was added to a {@link RDUniverse}
+        # or -1, and that universe. Equal concepts of a universe have the same id.
+        self._concept_id = -1
+        self._concept_universe = None
+
+        # The (type, canonical form, lower-cased reference) triple that
+        # equality is based on, and its hash, computed at the first request.
+        self._identity_key = None
+        self._identity_hash = 0
+
+    class ReferenceFeatures:
+        """
+        <p>What matching a reference against a user's description needs,
+        computed once: the positions of the content (non-functional) tokens
+        and their lemmas and lower-cased lemmas and word forms, which
+        are also indexed.</p>
+        """
+
+        def __init__(self, tokens, lexicon):
+            """
+            :param tokens: the processed reference;
+            :param lexicon: the lexicon that tells the functional words apart.
+            """
+            # Positions of the content tokens in the reference
+            self.positions = []
+            # For the content tokens:
+            self.lemmas = []
+            self.lower_lemmas = []
+            self.lower_wforms = []
+            for i, tok in enumerate(tokens):
+                if not lexicon.is_functional_pos(tok.POS):
+                    self.positions.append(i)
+                    self.lemmas.append(tok.lemma)
+                    self.lower_lemmas.append(tok.lemma.lower())
+                    self.lower_wforms.append(tok.wform.lower())
+            # Lemma, lower-cased lemma and lower-cased word form ->
+            # the first content token with it
+            self.lemma_index = {}
+            self.lower_lemma_index = {}
+            self.wform_index = {}
+            for k in range(len(self.positions) - 1, -1, -1):
+                self.lemma_index[self.lemmas[k]] = k
+                self.lower_lemma_index[self.lower_lemmas[k]] = k
+                self.wform_index[self.lower_wforms[k]] = k
+            # The number of tokens, functional ones included
+            self.size = len(tokens)
+            # The number of content tokens
+            self.length = len(self.positions)
+
     @staticmethod
     def builder(ctyp, cform, syns, ref):
         """
@@ -87,7 +140,8 @@ class RDConcept:
 
     def set_reference(self, value, text_processor):
         """
-        <p>Sets the reference for this concept.</p>
+        <p>Sets the reference for this concept. The reference of a concept
+        added to a {@link RDUniverse} cannot change, as it identifies it.</p>
         :param value: the reference to be set
         :param text_processor:
         :return:
@@ -95,8 +149,13 @@ class RDConcept:
         if value is not None:
             if self._assigned_reference is None \
                     or (self._assigned_reference is not None and value != self._assigned_reference):
+                if self._concept_id >= 0:
+                    raise RuntimeError("Cannot change the reference of concept '" + str(self) +
+                                       "', which was added to a universe!")
                 self._assigned_reference = value
                 self.assigned_reference_tokens = text_processor.text_processor(self._assigned_reference)
+                self.reference_features = None
+                self._identity_key = None
 
     def get_reference(self):
         """
@@ -116,6 +175,18 @@ class RDConcept:
         """
         return self.assigned_reference_tokens
 
+    def get_reference_features(self, lexicon):
+        """
+        <p>Gets the features of the tokenized reference
+        for matching with user's sayings.</p>
+        :param lexicon: the lexicon that tells the functional words apart;
+        :return: the {@link ReferenceFeatures} of the
+        {@link #assignedReferenceTokens} member field.
+        """
+        if self.reference_features is None:
+            self.reference_features = RDConcept.ReferenceFeatures(self.assigned_reference_tokens, lexicon)
+        return self.reference_features
+
     def get_canonical_name(self):
         """
         <p>Returns the "standard" name for this concept.</p>
@@ -123,6 +194,13 @@ class RDConcept:
         """
         return self._canonical_form
 
+    def get_synonyms(self):
+        """
+        <p>Returns the alternate names of this concept.</p>
+        :return: the {@link #synonymsOfCanonicalForm} member field.
+        """
+        return self._synonyms_of_canonical_form
+
     def get_type(self):
         """
         <p>Returns the type of this concept.</p>
@@ -130,11 +208,54 @@ class RDConcept:
         """
         return self._concept_type
 
-    def is_this_concept(self, word, word_net):
+    def get_concept_id(self):
+        """
+        <p>Returns the id of this concept.</p>
+        :return: the {@link #conceptId} member field, -1 if
+        this concept was not added to a universe.
+        """
+        return self._concept_id
+
+    def get_concept_universe(self):
+        """
+        :return: the {@link RDUniverse} that gave this concept its id or {@code null}.
+        """
+        return self._concept_universe
+
+    def set_concept_id(self, concept_id, universe):
+        self._concept_id = concept_id
+        self._concept_universe = universe
+
+    def has_same_universe(self, other):
+        """
+        :return: {@code true} if the ids of this concept and of
+                the other one were given by the same universe.
+        """
+        return self._concept_universe is not None and self._concept_universe is other._concept_universe
+
+    def get_identity_key(self):
+        """
+        <p>Returns what this concept is identified by: its type,
+        canonical form and lower-cased reference.</p>
+        :return: the {@link #identityKey} member field.
+        """
+        if self._identity_key is None:
+            reference = self._assigned_reference.lower() if self._assigned_reference is not None else None
+            self._identity_key = (self._concept_type, self._canonical_form, reference)
+            if reference is not None:
+                # The same hash as the equal constants.
+                self._identity_hash = hash((self._concept_type, reference))
+            else:
+                self._identity_hash = hash((self._concept_type, self._canonical_form))
+        return self._identity_key
+
+    def is_this_concept(self, word, word_net, max_hops=1):
         """
         <p>Tests if an arbitrary word refers to this concept.</p>
         :param word: the word to be tested;
         :param word_net: the interface to WordNet; if {@code null}, it is not used;
+        :param max_hops: how many WordNet links may separate the word from
+                    the canonical form of this concept;
         :return: {@code true} if the word signals the presence of this concept.
         """
         if self._canonical_form is None:
@@ -147,6 +268,8 @@ class RDConcept:
                 return True
 
         if word_net is not None:
+            if max_hops > 1:
+                return word_net.word_net_distance(word, self._canonical_form, max_hops) >= 0
             return word_net.word_net_equals(word, self._canonical_form)
 
         return False
@@ -159,15 +282,11 @@ class RDConcept:
 
     def __eq__(self, other):
         if isinstance(other, RDConcept):
-            if self._concept_type != other._concept_type:
-                return False
-            if self._canonical_form == other._canonical_form:
-                if self._assigned_reference is None and other._assigned_reference is None:
-                    return True
-                elif self._assigned_reference is not None and other._assigned_reference is not None \
-                        and self._assigned_reference.lower() == other._assigned_reference.lower():
-                    return True
+            if self.has_same_universe(other):
+                return self._concept_id == other._concept_id
+            return self.get_identity_key() == other.get_identity_key()
         return False
 
     def __hash__(self):
-        return hash(self._canonical_form)
+        self.get_identity_key()
+        return self._identity_hash
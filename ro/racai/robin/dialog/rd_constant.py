@@ -33,15 +33,14 @@ class RDConstant(RDConcept):
         :return:
         """
         if isinstance(other, RDConcept):
-            if self._concept_type != other._concept_type:
-                return False
-            if other._assigned_reference is None and self._assigned_reference is None:
-                return True
-            elif other._assigned_reference is not None and self._assigned_reference is not None \
-                    and other._assigned_reference.lower() == self._assigned_reference.lower():
+            if self.has_same_universe(other) and self._concept_id == other._concept_id:
                 return True
+            key = self.get_identity_key()
+            other_key = other.get_identity_key()
+            # Type and reference, whatever the canonical form of the concept
+            return key[0] == other_key[0] and key[2] == other_key[2]
 
         return False
 
     def __hash__(self):
-        return hash(self._canonical_form)
+        return super().__hash__()
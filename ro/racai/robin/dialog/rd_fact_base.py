@@ -0,0 +1,134 @@
+import weakref
+from array import array
+from collections.abc import Sequence
+
+
+class RDFactBase(Sequence):
+    """
+    <p>A compact store of the ``true'' predicates (facts) of a universe of
+    discourse. The predicate definitions (user intent, action verb and
+    synonyms) and the argument concepts are interned and a fact is only a
+    definition id and a run of concept ids. The ids are kept in typed
+    arrays, CSR-style: the arguments of fact {@code k} are the concepts
+    {@code arg_indices[arg_indptr[k]:arg_indptr[k + 1]]}.</p>
+    <p>It is a read-only sequence of {@link RDPredicate}s. The
+    predicate of a fact is built on demand and shares the synonym list of
+    its definition. While it is in use, the same object is returned
+    for the same fact.</p>
+    """
+
+    def __init__(self):
+        # Definition id -> predicate without arguments
+        self.__definitions = []
+        # (user intent, action verb, synonyms) -> definition id
+        self.__definition_ids = {}
+        # Concept id -> concept
+        self.__concepts = []
+        # Universe concept id, see {@link RDConcept#get_concept_id()} -> concept id
+        self.__concept_ids = {}
+        # Fact -> definition id
+        self.__fact_definitions = array("i")
+        self.__arg_indptr = array("i", [0])
+        self.__arg_indices = array("i")
+        # Fact -> its predicate, while in use
+        self.__views = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self.__fact_definitions)
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("Fact index out of range!")
+        pred = self.__views.get(k)
+        if pred is None:
+            pred = self.__definitions[self.__fact_definitions[k]].with_arguments(
+                [self.__concepts[c] for c in self.get_argument_ids(k)])
+            self.__views[k] = pred
+        return pred
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self[k]
+
+    def definition_id(self, pred):
+        """
+        <p>Interns the definition (user intent, action verb and
+        synonyms) of a predicate.</p>
+        :param pred: the predicate;
+        :return: the id of its definition.
+        """
+        key = (pred.get_user_intent(), pred.get_action_verb(), tuple(pred.get_synonyms()))
+        if key not in self.__definition_ids:
+            self.__definition_ids[key] = len(self.__definitions)
+            self.__definitions.append(pred.with_arguments([]))
+        return self.__definition_ids[key]
+
+    def concept_id(self, conc):
+        """
+        <p>Interns an argument concept, by its id in the universe.</p>
+        :param conc: the concept, interned by a {@link RDUniverse};
+        :return: the id of the concept in this fact base.
+        """
+        if conc.get_concept_id() < 0:
+            raise RuntimeError("Concept '" + str(conc) + "' was not interned by a universe!")
+        if conc.get_concept_id() not in self.__concept_ids:
+            self.__concept_ids[conc.get_concept_id()] = len(self.__concepts)
+            self.__concepts.append(conc)
+        return self.__concept_ids[conc.get_concept_id()]
+
+    def add_fact(self, pred, rd_concepts):
+        """
+        <p>Adds a fact, without building a predicate for it.</p>
+        :param pred: the predicate whose definition the fact has, e.g. a
+                    {@code PREDICATE} line of a micro-world;
+        :param rd_concepts: the bound arguments of the fact.
+        :return:
+        """
+        self.__fact_definitions.append(self.definition_id(pred))
+        for conc in rd_concepts:
+            self.__arg_indices.append(self.concept_id(conc))
+        self.__arg_indptr.append(len(self.__arg_indices))
+
+    def add_predicate(self, pred):
+        self.add_fact(pred, pred.get_arguments())
+
+    def get_definitions(self):
+        """
+        :return: the list of the distinct predicate definitions, without arguments.
+        """
+        return self.__definitions
+
+    def get_definition_id(self, k):
+        """
+        :return: the definition id of fact {@code k}.
+        """
+        return self.__fact_definitions[k]
+
+    def get_concepts(self):
+        """
+        :return: the list of the argument concepts, by concept id.
+        """
+        return self.__concepts
+
+    def get_argument_ids(self, k):
+        """
+        :return: the concept ids of the arguments of fact {@code k}.
+        """
+        return self.__arg_indices[self.__arg_indptr[k]:self.__arg_indptr[k + 1]]
+
+    def get_argument_indptr(self):
+        """
+        <p>The CSR row pointers: the arguments of fact {@code k} start at
+        {@code get_argument_indptr()[k]} in {@link #get_argument_indices()}.
+        The array is not a copy and must not be modified.</p>
+        """
+        return self.__arg_indptr
+
+    def get_argument_indices(self):
+        """
+        <p>The concept ids of the arguments of all the facts, in order.
+        The array is not a copy and must not be modified.</p>
+        """
+        return self.__arg_indices
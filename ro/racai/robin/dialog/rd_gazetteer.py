@@ -0,0 +1,66 @@
+from ro.racai.robin.nlp.aho_corasick import AhoCorasick
+from ro.racai.robin.nlp.string_utils import StringUtils
+
+
+class RDGazetteer:
+    """
+    <p>A token-level trie over the surface forms (references) of the
+    bound concepts and constants of a {@link RDUniverse}, e.g.
+    <i>sala de consiliu</i>, <i>laboratorul de SDA</i> or <i>Adriana Vlad</i>.
+    It finds exact mentions of these concepts in the user's text
+    with one linear scan.</p>
+    """
+
+    def __init__(self):
+        self.__matcher = AhoCorasick()
+        # Lower-cased surface form -> list of concepts
+        self.__surface_forms = {}
+
+    @staticmethod
+    def surface_form(text):
+        """
+        <p>Get the key under which a reference is stored.</p>
+        :param text: the reference of a concept;
+        :return: the tuple of lower-cased words of {@code text}.
+        """
+        return tuple([w.lower() for w in StringUtils.split_words(text)])
+
+    def add_concept(self, conc):
+        """
+        <p>Adds the reference of a bound concept to this gazetteer.</p>
+        :param conc: the concept to add; if it does not have a
+                    reference, it is not added.
+        :return:
+        """
+        if StringUtils.is_none_empty_or_blank(conc.get_reference()):
+            return
+        key = RDGazetteer.surface_form(conc.get_reference())
+        if not key:
+            return
+        if key not in self.__surface_forms:
+            self.__surface_forms[key] = []
+            self.__matcher.add_pattern(key, self.__surface_forms[key])
+        if conc not in self.__surface_forms[key]:
+            self.__surface_forms[key].append(conc)
+
+    def find_mentions(self, words):
+        """
+        <p>Finds the leftmost-longest exact mentions of concepts.</p>
+        :param words: the words of the user's text;
+        :return: a list of (start, end, concepts) triples, {@code end} exclusive.
+        """
+        if self.__matcher.is_empty():
+            return []
+        return self.__matcher.find_longest([w.lower() for w in words])
+
+    def mentioned_concepts(self, tokens):
+        """
+        <p>Gets all the concepts that are mentioned exactly in a list of tokens.</p>
+        :param tokens: the list of {@link Token}s to search in;
+        :return: the list of mentioned concepts, possibly empty.
+        """
+        result = []
+        words = StringUtils.split_words(" ".join([t.wform for t in tokens]))
+        for start, end, concepts in self.find_mentions(words):
+            result.extend(concepts)
+        return result
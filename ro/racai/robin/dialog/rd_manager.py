@@ -1,6 +1,7 @@
 import getopt
 import sys
 
+from ro.racai.robin.dialog.rd_query_templates import RDQueryTemplates
 from ro.racai.robin.dialog.rd_robot_behaviour import RDRobotBehaviour
 from ro.racai.robin.dialog.ro_sayings import RoSayings
 from ro.racai.robin.mw.mw_file_reader import MWFileReader
@@ -8,6 +9,7 @@ from ro.racai.robin.nlp.q_type import QType
 from ro.racai.robin.nlp.ro_lexicon import RoLexicon
 from ro.racai.robin.nlp.ro_text_processor import RoTextProcessor
 from ro.racai.robin.nlp.ro_word_net import RoWordNet
+from ro.racai.robin.nlp.string_utils import StringUtils
 
 
 class RDManager:
@@ -24,6 +26,15 @@ class RDManager:
 
         self.__discourse_universe = None
         self.__microworld_name = None
+        # Question templates that bypass text processing.
+        self.__query_templates = None
+        # Words of the last partial user input
+        # and how many of them are stable.
+        self.__partial_words = []
+        self.__stable_length = 0
+        # (text, query, predicate match) computed
+        # ahead of time from a partial user input.
+        self.__speculation = None
 
     class DialogueState:
         """
@@ -105,6 +116,10 @@ class RDManager:
         self.__microworld_name = mwr.get_microworld_name()
         # Set concepts on the text processor...
         self.__resource_text_proc.set_concept_list(self.__discourse_universe.get_universe_concepts())
+        self.__query_templates = RDQueryTemplates(self.__discourse_universe, self.__resource_text_proc)
+        # Look up the microworld vocabulary in WordNet, in parallel.
+        self.__resource_word_net.prefetch(self.__discourse_universe.get_vocabulary())
+        self.__discourse_universe.build_indexes()
 
     def get_microworld_name(self):
         return self.__microworld_name
@@ -130,7 +145,15 @@ class RDManager:
                     from the ASR module;
         :return: a current state of the dialogue.
         """
-        q = self.__resource_text_proc.query_analyzer(self.__resource_text_proc.text_processor(user_input))
+        text = self.__resource_text_proc.normalize_text(user_input)
+        if self.__speculation is not None and self.__speculation[0] == text:
+            q, pm = self.__speculation[1], self.__speculation[2]
+        else:
+            q, pm = self.analyze_user_input(user_input)
+        self.__partial_words = []
+        self.__stable_length = 0
+        self.__speculation = None
+
         if q.query_type == QType.HELLO:
             self.__current_d_state = self.DialogueState.robot_says_something(
                 q.query_type,
@@ -143,7 +166,6 @@ class RDManager:
                                                            self.__resource_sayings.robot_closing_lines())
 
         # 1. Try and match the query first...
-        pm = self.__discourse_universe.resolve_query(q)
         if pm.matched_predicate is None:
             # No predicate found, this means no
             # predicate was found in KB. Return this
@@ -163,23 +185,93 @@ class RDManager:
             # enough information specified. Try to do a
             # match in the context of the previously
             # matched predicate.
-            pm = self.__discourse_universe.resolve_query_in_context(q, self.__current_d_state.inferred_predicate)
-            if pm.said_argument_index >= 0:
+            with self.__discourse_universe.word_distance.scratch_scope():
+                pm = self.__discourse_universe.resolve_query_in_context(
+                    q, self.__current_d_state.inferred_predicate)
+            if pm is not None and pm.said_argument_index >= 0:
                 self.__current_d_state = self.DialogueState.robot_informed_response(q.query_type, pm)
             else:
+                # The previous predicate does not answer it either.
                 self.__current_d_state = self.DialogueState.robot_says_something(
                     q.query_type,
-                    self.__resource_sayings.robot_dont_know_lines)
+                    self.__resource_sayings.robot_dont_know_lines())
         else:
             # No predicate found, this means no
             # predicate was found in KB. Return this
             # and say we do not know about it.
             self.__current_d_state = self.DialogueState.robot_says_something(
                         q.query_type,
-                        self.__resource_sayings.robot_dont_know_lines)
+                        self.__resource_sayings.robot_dont_know_lines())
 
         return self.__current_d_state
 
+    def analyze_user_input(self, user_input, cached_only=False):
+        """
+        <p>Builds the query from the user input and matches it
+        against the universe of discourse. Fixed expressions and template
+        questions are not sent to the text processor.</p>
+        :param user_input: the user input, as given by the ASR module;
+        :param cached_only: if {@code true}, only use the processed text cache;
+        :return: a (query, predicate match) pair; the predicate match
+                is {@code null} for fixed expressions. If {@code cached_only}
+                is set and the input was not processed before, {@code null}.
+        """
+        # Fixed expressions are recognized in the raw text.
+        words = StringUtils.split_words(self.__resource_text_proc.normalize_text(user_input))
+        if self.__resource_sayings.user_opening_statement(words):
+            return self.__resource_text_proc.Query(QType.HELLO), None
+        if self.__resource_sayings.user_closing_statement(words):
+            return self.__resource_text_proc.Query(QType.GOODBYE), None
+
+        q = None
+        if self.__query_templates is not None:
+            q = self.__query_templates.match(user_input)
+        if q is None:
+            if cached_only:
+                tokens = self.__resource_text_proc.cached_text_processor(user_input)
+                if tokens is None:
+                    return None
+            else:
+                tokens = self.__resource_text_proc.text_processor(user_input)
+                if self.__query_templates is not None:
+                    self.__query_templates.learn_verb_forms(tokens)
+            q = self.__resource_text_proc.query_analyzer(tokens)
+        pm = None
+        if q is not None and q.query_type != QType.HELLO and q.query_type != QType.GOODBYE:
+            with self.__discourse_universe.word_distance.scratch_scope():
+                pm = self.__discourse_universe.resolve_query(q)
+        return q, pm
+
+    def feed_partial_input(self, partial_input):
+        """
+        <p>Feed a partial transcript from the ASR module, while the user
+        is still speaking. Words that did not change between two consecutive
+        partial transcripts are stable and WordNet data for them is looked up
+        ahead of time. If the partial transcript is a template question or it is
+        already in the text processor cache, the query is also resolved ahead of time and reused by
+        {@link #do_conversation(String)} if the final transcript is the same.</p>
+        :param partial_input: the partial transcript from the ASR module.
+        :return:
+        """
+        if self.__discourse_universe is None or StringUtils.is_none_empty_or_blank(partial_input):
+            return
+        words = [w.lower() for w in StringUtils.split_words(partial_input)]
+        # The last word may still change while the user speaks.
+        stable = 0
+        while stable < len(words) - 1 and stable < len(self.__partial_words) \
+                and words[stable] == self.__partial_words[stable]:
+            stable += 1
+        if stable > self.__stable_length:
+            self.__discourse_universe.warm_up(words[self.__stable_length:stable])
+        self.__stable_length = stable
+        self.__partial_words = words
+
+        text = self.__resource_text_proc.normalize_text(partial_input)
+        if self.__speculation is None or self.__speculation[0] != text:
+            result = self.analyze_user_input(text, True)
+            if result is not None:
+                self.__speculation = (text, result[0], result[1])
+
     def dump_resource_caches(self):
         """
         Method to dump the resource caches so that
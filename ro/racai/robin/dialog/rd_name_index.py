@@ -0,0 +1,116 @@
+class RDNameIndex:
+    """
+    <p>Maps the words of the user to the names they refer to. A name is
+    a canonical form with its synonyms, shared by many concepts
+    (e.g. <i>sală</i>, <i>cameră</i>) or predicates (e.g. <i>ține</i>,
+    <i>desfășura</i>).</p>
+    <p>The canonical forms, the synonyms and the WordNet neighbourhoods of
+    the canonical forms, up to the given number of hops, are indexed once,
+    see {@link #build(int)}. A user's word is then matched through the
+    index and its own WordNet neighbourhood, as WordNet relations need not
+    be symmetrical, and the answer for the word is memoized.</p>
+    """
+
+    # The maximum number of WordNet words in a neighbourhood of more
+    # than 1 hop; the words 1 hop away are always all there.
+    MAX_NODES = 100
+
+    def __init__(self, word_net):
+        """
+        :param word_net: the WordNet to take the neighbours of the words from.
+        """
+        self.__word_net = word_net
+        # (canonical form, synonyms) -> name id
+        self.__name_ids = {}
+        # Indexed word -> {name id -> WordNet hops from the canonical form};
+        # built when first needed.
+        self.__index = None
+        # The number of WordNet hops the index was built for.
+        self.__max_hops = None
+        # User's word -> frozen set of name ids
+        self.__word_names = {}
+
+    def __len__(self):
+        return len(self.__name_ids)
+
+    def add(self, cform, synonyms):
+        """
+        <p>Adds a name to this index, if it is not there already.</p>
+        :param cform: the canonical form of the name;
+        :param synonyms: the synonyms of the canonical form;
+        :return: the id of the name.
+        """
+        key = (cform, tuple(synonyms))
+        if key not in self.__name_ids:
+            self.__name_ids[key] = len(self.__name_ids)
+            self.__index = None
+        return self.__name_ids[key]
+
+    def name_id(self, cform, synonyms):
+        """
+        :return: the id of the name or -1 if it was not added.
+        """
+        return self.__name_ids.get((cform, tuple(synonyms)), -1)
+
+    def build(self, max_hops=1):
+        """
+        <p>Indexes the names of this object, e.g. when the micro-world is loaded.
+        Adding a name afterwards causes a rebuild at the next lookup.</p>
+        :param max_hops: how many WordNet links may separate
+                    a word from a canonical form.
+        :return:
+        """
+        self.__index = {}
+        self.__max_hops = max_hops
+        self.__word_names = {}
+        for (cform, synonyms), name in self.__name_ids.items():
+            for word, hops in self.__neighbourhood(cform, max_hops).items():
+                names = self.__index.setdefault(word, {})
+                names[name] = min(hops, names.get(name, hops))
+            for syn in synonyms:
+                # Synonyms are matched as they are: with max_hops,
+                # only the user's word itself can reach them.
+                names = self.__index.setdefault(syn, {})
+                names[name] = min(max_hops, names.get(name, max_hops))
+
+    def __neighbourhood(self, word, max_hops):
+        """
+        :return: the words at most {@code max_hops} WordNet links away
+                from {@code word}, with their number of links.
+        """
+        hops = {word: 0}
+        if self.__word_net is None:
+            return hops
+        frontier = [word]
+        for hop in range(1, max_hops + 1):
+            next_frontier = []
+            for node in frontier:
+                # Sorted, so that the same words are kept when capped.
+                for neighbour in sorted(self.__word_net.get_record(node).neighbours):
+                    if neighbour not in hops and (hop == 1 or len(hops) < RDNameIndex.MAX_NODES):
+                        hops[neighbour] = hop
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return hops
+
+    def lookup(self, word, max_hops=1):
+        """
+        <p>Finds the names that a word refers to: the word and a canonical
+        form are at most {@code max_hops} WordNet links apart, searching
+        from both of them, or the word is a synonym of the name.</p>
+        :param word: the word of the user;
+        :param max_hops: how many WordNet links may separate
+                    the word from a canonical form;
+        :return: the frozen set of the ids of the names.
+        """
+        if self.__index is None or max_hops != self.__max_hops:
+            self.build(max_hops)
+        word = word.strip().lower()
+        if word not in self.__word_names:
+            names = set()
+            for node, word_hops in self.__neighbourhood(word, max_hops).items():
+                for name, name_hops in self.__index.get(node, {}).items():
+                    if word_hops + name_hops <= max_hops:
+                        names.add(name)
+            self.__word_names[word] = frozenset(names)
+        return self.__word_names[word]
@@ -74,6 +74,13 @@ class RDPredicate:
         """
         return self.__action_verb
 
+    def get_synonyms(self):
+        """
+        <p>Get the alternate names of this predicate.</p>
+        :return: the {@link #synonymsOfActionVerb} member field.
+        """
+        return self.__synonyms_of_action_verb
+
     def get_user_intent(self):
         """
         <p>Get the user intent associated with this predicate.</p>
@@ -119,11 +126,26 @@ class RDPredicate:
 
         return predicate
 
-    def is_this_predicate(self, word, word_net):
+    def with_arguments(self, rd_concepts):
+        """
+        <p>Convenience method for returning a predicate with the name
+        of this one and other arguments. The synonyms are not copied,
+        the new predicate shares them with this one.</p>
+        :param rd_concepts: the arguments of the new predicate;
+        :return: the new predicate.
+        """
+        predicate = RDPredicate(self.__user_intention, self.__action_verb)
+        predicate.__synonyms_of_action_verb = self.__synonyms_of_action_verb
+        predicate.__predicate_arguments = list(rd_concepts)
+        return predicate
+
+    def is_this_predicate(self, word, word_net, max_hops=1):
         """
         <p>Tests if an arbitrary word refers to this predicate (name).</p>
         :param word: the word to be tested;
         :param word_net: the interface to WordNet; if {@code null}, it is not used;
+        :param max_hops: how many WordNet links may separate the word from
+                    the action verb of this predicate;
         :return: {@code true} if the word signals the presence of this predicate.
         """
         word = word.strip().lower()
@@ -135,6 +157,8 @@ class RDPredicate:
                 return True
 
         if word_net is not None:
+            if max_hops > 1:
+                return word_net.word_net_distance(word, self.__action_verb, max_hops) >= 0
             return word_net.word_net_equals(word, self.__action_verb)
 
         return False
@@ -0,0 +1,176 @@
+import re
+
+from ro.racai.robin.dialog.rd_universe import RDUniverse
+from ro.racai.robin.nlp.q_type import QType
+from ro.racai.robin.nlp.string_utils import StringUtils
+
+
+class RDQueryTemplates:
+    """
+    <p>Question templates derived from a micro-world and compiled into
+    a single regular expression. A template question is made of an
+    interrogative (<i>unde</i>, <i>când</i>, <i>cine</i>), an optional
+    reflexive <i>se</i>, a predicate verb and a concept reference, e.g.
+    <i>Unde se ține cursul de sisteme de operare?</i>.</p>
+    <p>Such questions are turned directly into a {@link Query} object,
+    without calling {@link TextProcessor#process_text(String)}.
+    Questions without diacritics, as some ASR engines write them,
+    match too.</p>
+    """
+
+    # Interrogative lemma -> (POS, dependency relation, query type)
+    # as the TEPROLIN web service annotates them.
+    INTERROGATIVES = {
+        "unde": ("Rw", "advmod", QType.LOCATION),
+        "când": ("Rw", "advmod:tmod", QType.TIME),
+        "cine": ("Pw3--r", "nsubj", QType.PERSON)
+    }
+
+    # Romanian letters with diacritics -> the same letters without.
+    DIACRITICS = str.maketrans("ăâîșşțţĂÂÎȘŞȚŢ", "aaissttAAISSTT")
+
+    @staticmethod
+    def fold(text):
+        """
+        <p>Removes the Romanian diacritics from a text. The
+        length of the text and the positions in it do not change.</p>
+        :param text: the text;
+        :return: the text without diacritics.
+        """
+        return text.translate(RDQueryTemplates.DIACRITICS)
+
+    def __init__(self, universe, text_processor):
+        """
+        :param universe: the {@link RDUniverse} to derive the templates from;
+        :param text_processor: the text processor whose {@link Query},
+                    {@link Argument} and {@link Token} objects are built.
+        """
+        self.__universe = universe
+        self.__text_processor = text_processor
+        # Verb word form -> predicate lemma (action verb or synonym)
+        self.__verb_forms = {}
+        # Lower-cased verb word form, without diacritics -> predicate lemma;
+        # built with the matcher.
+        self.__folded_verb_forms = {}
+        # Lower-cased reference, without diacritics -> list of concepts with that reference
+        self.__references = {}
+        # Predicate lemma -> concept type of an argument -> the types
+        # of the other arguments of the facts with that argument
+        self.__verb_types = {}
+        # The compiled matcher, rebuilt when new verb forms are learned.
+        self.__template_regex = None
+
+        facts = universe.get_universe_predicates()
+        fact_concepts = facts.get_concepts()
+        # Definition id -> argument type -> the types of the other arguments
+        definition_types = [{} for pdef in facts.get_definitions()]
+        for k in range(len(facts)):
+            types = [fact_concepts[c].get_type() for c in facts.get_argument_ids(k)]
+            arg_types = definition_types[facts.get_definition_id(k)]
+            for i, ctyp in enumerate(types):
+                arg_types.setdefault(ctyp, set()).update(types[:i] + types[i + 1:])
+
+        for pdef, arg_types in zip(facts.get_definitions(), definition_types):
+            lemmas = [pdef.get_action_verb()]
+            lemmas.extend(pdef.get_synonyms())
+            for lemma in lemmas:
+                self.__verb_forms.setdefault(lemma, lemma)
+                verb_types = self.__verb_types.setdefault(lemma, {})
+                for ctyp, other_types in arg_types.items():
+                    verb_types.setdefault(ctyp, set()).update(other_types)
+
+        for conc in universe.get_universe_concepts():
+            if conc.get_canonical_name() is None or not conc.get_tokenized_reference():
+                continue
+            self.__references.setdefault(RDQueryTemplates.__reference_key(conc.get_reference()), []).append(conc)
+
+        for tokens in text_processor.get_cached_tokens():
+            self.learn_verb_forms(tokens)
+
+    def learn_verb_forms(self, tokens):
+        """
+        <p>Learns inflected forms of the predicate verbs from an
+        annotated text, e.g. <i>desfășoară</i> for <i>desfășura</i>.</p>
+        :param tokens: the annotated text.
+        :return:
+        """
+        for tok in tokens:
+            if tok.POS.startswith("Vm"):
+                lemma = tok.lemma.lower()
+                wform = tok.wform.lower()
+                if lemma in self.__verb_forms and wform not in self.__verb_forms:
+                    self.__verb_forms[wform] = lemma
+                    self.__template_regex = None
+
+    @staticmethod
+    def __reference_key(ref):
+        return RDQueryTemplates.fold(" ".join(StringUtils.split_words(ref.lower())))
+
+    def __compile(self):
+        def alternatives(strings):
+            # Longest first, so that the longest reference wins.
+            return "|".join(sorted(strings, key=len, reverse=True))
+
+        self.__folded_verb_forms = {}
+        for wform, lemma in self.__verb_forms.items():
+            self.__folded_verb_forms.setdefault(RDQueryTemplates.fold(wform), lemma)
+        verbs = alternatives([re.escape(v) for v in self.__folded_verb_forms])
+        refs = alternatives(["\\W+".join([re.escape(w) for w in ref.split()])
+                             for ref in self.__references])
+        qwords = alternatives([RDQueryTemplates.fold(qw) for qw in RDQueryTemplates.INTERROGATIVES])
+        self.__template_regex = re.compile(
+            "^(?P<qw>" + qwords + ")\\s+" +
+            "(?:se\\s+)?(?P<verb>" + verbs + ")\\s+" +
+            "(?P<ref>" + refs + ")\\W*$", re.IGNORECASE)
+
+    def match(self, text):
+        """
+        <p>Matches a raw user input against the templates.</p>
+        :param text: the raw user input;
+        :return: the {@link Query} object or {@code null} if
+                no template matched the input.
+        """
+        if not self.__references or not self.__verb_forms:
+            return None
+        if self.__template_regex is None:
+            self.__compile()
+
+        text = self.__text_processor.normalize_text(text)
+        tm = self.__template_regex.match(RDQueryTemplates.fold(text))
+        if tm is None:
+            return None
+        concepts = self.__references.get(RDQueryTemplates.__reference_key(tm.group("ref")))
+        if concepts is None or len(concepts) > 1:
+            # Ambiguous references go through the full analysis.
+            return None
+
+        # The folded text has the same positions as the text.
+        qword = text[tm.start("qw"):tm.end("qw")]
+        qlemma = [qw for qw in RDQueryTemplates.INTERROGATIVES
+                  if RDQueryTemplates.fold(qw) == tm.group("qw").lower()][0]
+        qpos, qdrel, qtyp = RDQueryTemplates.INTERROGATIVES[qlemma]
+        result = self.__text_processor.Query()
+        result.action_verb = self.__folded_verb_forms[tm.group("verb").lower()]
+        if self.__universe.lexicon.is_command_verb(result.action_verb):
+            result.query_type = QType.COMMAND
+        else:
+            result.query_type = qtyp
+
+        # The facts of the verb must relate the reference to the asked type,
+        # e.g. not "Unde se ține 209?", which asks the location of a location.
+        other_types = self.__verb_types.get(result.action_verb, {}).get(concepts[0].get_type())
+        if other_types is None or (result.query_type in RDUniverse.QTYPE_CTYPES and
+                                   RDUniverse.QTYPE_CTYPES[result.query_type] not in other_types):
+            return None
+
+        q_tokens = [self.__text_processor.Token(qword, qlemma, qpos, 0, qdrel, True)]
+        result.predicate_arguments.append(self.__text_processor.Argument(q_tokens, True))
+        # The head of the reference noun phrase is the verb dependent.
+        r_tokens = []
+        for tok in concepts[0].get_tokenized_reference():
+            r_tokens.append(self.__text_processor.Token(tok.wform, tok.lemma, tok.POS,
+                                                        tok.head, tok.drel, tok.head == 0))
+        r_arg = self.__text_processor.Argument(r_tokens, self.__text_processor.is_query_variable(r_tokens))
+        r_arg.exact_concepts = [concepts[0]]
+        result.predicate_arguments.append(r_arg)
+        return result
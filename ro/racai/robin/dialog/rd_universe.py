@@ -1,8 +1,22 @@
+from array import array
+from collections import OrderedDict
+
 from ro.racai.robin.dialog.ctype import CType
+from ro.racai.robin.dialog.rd_concept import RDConcept
+from ro.racai.robin.dialog.rd_fact_base import RDFactBase
+from ro.racai.robin.dialog.rd_gazetteer import RDGazetteer
+from ro.racai.robin.dialog.rd_name_index import RDNameIndex
 from ro.racai.robin.dialog.rd_predicate import RDPredicate
+from ro.racai.robin.nlp.bk_tree import BKTree
 from ro.racai.robin.nlp.levenshtein import Levenshtein
 from ro.racai.robin.nlp.q_type import QType
 
+try:
+    import numpy
+except ImportError:
+    # Predicates are scored one by one.
+    numpy = None
+
 
 class RDUniverse:
     """
@@ -26,14 +40,17 @@ class RDUniverse:
         # Bound concepts in this universe of discourse.
         # Fill in this list using {@link #addConcept(RDConcept)}.
         self.concepts = []
-        # Predicates that are true in this universe.
+        # Identity key of a concept -> concept id, so that
+        # equal concepts in this universe have the same id.
+        self.__concept_ids = {}
+        # Predicates that are true in this universe, an {@link RDFactBase}.
         # Use {@link #addPredicate()} method to fill in this list.
-        self.predicates = []
+        self.predicates = RDFactBase()
         # The word distance object used to compute
         # Levenshtein distances.
         self.word_distance = Levenshtein()
         # The WordNet object that is used to find
-        # "similar" words.
+        # "similar" words; if null, it is not used.
         self.word_net = word_net
         # Lexicon to test for functional words
         # when matching descriptions.
@@ -41,6 +58,44 @@ class RDUniverse:
         # The TextProcessor to use to compute
         # a special type of sentence length.
         self.text_processor = text_processor
+        # How many WordNet links may separate a user's word
+        # from a concept or predicate name. 1 means direct
+        # synonyms, hypernyms and hyponyms.
+        self.word_net_max_hops = 1
+        # Surface forms of the bound concepts, to find
+        # exact mentions of them in the user's text.
+        self.gazetteer = RDGazetteer()
+        # Lower-cased word forms of the concept references,
+        # to find the ones close to a user's word.
+        self.reference_words = BKTree(self.word_distance)
+        # The same words, in a list and, when first needed, in a {@link Levenshtein.Batch}.
+        self.__reference_word_list = []
+        self.__reference_batch = None
+        # User's word -> {reference word -> distance},
+        # the least recently used first
+        self.__word_neighbours = OrderedDict()
+        # The names (canonical form and synonyms) of the bound concepts.
+        self.__concept_names = RDNameIndex(word_net)
+        # The names (action verb and synonyms) of the predicates;
+        # built, with the other predicate indexes, when first needed.
+        self.__verb_names = None
+        # Verb name id -> indices of the predicates with that name
+        self.__verb_facts = []
+        # (user's verb, WordNet hops) -> indices of the predicates it refers to
+        self.__verb_predicates = {}
+        # Concept id of an argument -> sorted array of the
+        # indices of the predicates with that argument
+        self.__concept_facts = {}
+        # Concept type -> sorted array of the indices of the predicates
+        # with an argument of that type
+        self.__type_facts = {}
+        # The distinct arguments of the predicates, by fact base concept id
+        self.__fact_concepts = []
+        # (concept id, query argument key) -> similarity score,
+        # the least recently used first
+        self.__similarity_memo = OrderedDict()
+        self.__similarity_hits = 0
+        self.__similarity_misses = 0
 
     def get_universe_concepts(self):
         """
@@ -57,6 +112,14 @@ class RDUniverse:
         """
         return self.predicates
 
+    def get_predicate_definitions(self):
+        """
+        <p>Get the distinct definitions (user intent, action verb
+        and synonyms) of the universe predicates.</p>
+        :return: the list of predicates without arguments.
+        """
+        return self.predicates.get_definitions()
+
     def add_concept(self, conc):
         """
         <p>Adds a concept built with {@link RDConcept#Builder(CType, String, List, String)} to
@@ -65,19 +128,231 @@ class RDUniverse:
         :param conc: the bound (instantiated) concept to be added to this universe
         :return: void
         """
+        self.intern_concept(conc)
         self.concepts.append(conc)
+        self.gazetteer.add_concept(conc)
+        for wform in conc.get_reference_features(self.lexicon).lower_wforms:
+            if wform not in self.reference_words:
+                self.reference_words.add(wform)
+                self.__reference_word_list.append(wform)
+                self.__reference_batch = None
+        self.__word_neighbours.clear()
+        self.__similarity_memo.clear()
+        if conc.get_canonical_name() is not None:
+            self.__concept_names.add(conc.get_canonical_name(), conc.get_synonyms())
+
+    def intern_concept(self, conc):
+        """
+        <p>Gives a concept its id in this universe. Equal concepts get the same
+        id, so that comparing concepts added to a universe is comparing their
+        ids. A concept cannot be added to two universes.</p>
+        :param conc: the concept;
+        :return: the id of the concept.
+        """
+        if conc.get_concept_universe() is not None and conc.get_concept_universe() is not self:
+            raise RuntimeError("Concept '" + str(conc) + "' belongs to another universe!")
+        concept_id = self.__concept_ids.setdefault(conc.get_identity_key(), len(self.__concept_ids))
+        conc.set_concept_id(concept_id, self)
+        return concept_id
 
     def add_predicate(self, pred):
         """
         <p>Adds a ``true'' predicate to this universe of discourse.
+        The universe keeps its definition and arguments, not the object.
         :param pred: the predicate to add to this universe
         :return:
         """
-        self.predicates.append(pred)
+        for conc in pred.get_arguments():
+            self.intern_concept(conc)
+        self.predicates.add_predicate(pred)
+        self.__verb_names = None
 
     def add_predicates(self, preds):
-        self.predicates.clear()
-        self.predicates.extend(preds)
+        """
+        <p>Replaces the ``true'' predicates of this universe of discourse.</p>
+        :param preds: an {@link RDFactBase} of concepts interned by this universe,
+                    see {@link #intern_concept(RDConcept)}, which is used as it is,
+                    or a list of predicates.
+        :return:
+        """
+        if isinstance(preds, RDFactBase):
+            for conc in preds.get_concepts():
+                self.intern_concept(conc)
+            self.predicates = preds
+        else:
+            self.predicates = RDFactBase()
+            for pred in preds:
+                for conc in pred.get_arguments():
+                    self.intern_concept(conc)
+                self.predicates.add_predicate(pred)
+        self.__verb_names = None
+
+    # The concept type of the answer to a query type.
+    QTYPE_CTYPES = {
+        QType.LOCATION: CType.LOCATION,
+        QType.TIME: CType.TIME,
+        QType.PERSON: CType.PERSON
+    }
+
+    def __build_fact_index(self):
+        self.__verb_names = RDNameIndex(self.word_net)
+        self.__verb_facts = []
+        self.__verb_predicates = {}
+        self.__fact_concepts = self.predicates.get_concepts()
+        # Definition id -> verb name id
+        definition_names = []
+        for pdef in self.predicates.get_definitions():
+            definition_names.append(self.__verb_names.add(pdef.get_action_verb(), pdef.get_synonyms()))
+        self.__verb_facts = [[] for name in range(len(self.__verb_names))]
+        # Fact base concept id -> sorted array of the facts that have it,
+        # i.e. the columns of the CSR argument matrix
+        concept_postings = [array("i") for c in range(len(self.__fact_concepts))]
+        for k in range(len(self.predicates)):
+            for c in self.predicates.get_argument_ids(k):
+                postings = concept_postings[c]
+                if not postings or postings[-1] != k:
+                    postings.append(k)
+            self.__verb_facts[definition_names[self.predicates.get_definition_id(k)]].append(k)
+        # The fact base has one concept per concept id.
+        self.__concept_facts = {conc.get_concept_id(): concept_postings[c]
+                                for c, conc in enumerate(self.__fact_concepts)}
+        type_concepts = {}
+        for c, conc in enumerate(self.__fact_concepts):
+            type_concepts.setdefault(conc.get_type(), []).append(c)
+        self.__type_facts = {ctype: RDUniverse.__merge_postings([concept_postings[c] for c in concepts])
+                             for ctype, concepts in type_concepts.items()}
+
+    @staticmethod
+    def __merge_postings(postings):
+        """
+        :return: the sorted array of the indices in any of the sorted arrays.
+        """
+        if len(postings) == 1:
+            return postings[0]
+        return array("i", sorted(set().union(*postings)))
+
+    def get_verb_predicates(self, verb):
+        """
+        <p>Finds the predicates that a verb refers to, see
+        {@link RDPredicate#is_this_predicate(String, WordNet, int)}.
+        Predicates with the same action verb and synonyms are checked once.</p>
+        :param verb: the action verb of the user's query;
+        :return: the list of the predicates the verb refers to, in the
+                order of {@link #get_universe_predicates()}.
+        """
+        return [self.predicates[k] for k in self.__verb_fact_ids(verb)]
+
+    def __verb_fact_ids(self, verb):
+        if self.__verb_names is None:
+            self.__build_fact_index()
+        key = (verb.strip().lower(), self.word_net_max_hops)
+        if key not in self.__verb_predicates:
+            facts = []
+            for name in self.__verb_names.lookup(verb, self.word_net_max_hops):
+                facts.extend(self.__verb_facts[name])
+            facts.sort()
+            self.__verb_predicates[key] = facts
+        return self.__verb_predicates[key]
+
+    def get_candidate_facts(self, query):
+        """
+        <p>Restricts the predicates that can answer a query, before any
+        fuzzy scoring: they must have all the concepts that the query
+        mentions exactly and, for a LOCATION, TIME or PERSON query,
+        an argument of that type.</p>
+        :param query: the parsed {@link Query} object, with the exact
+                    mentions bound, see {@link #bind_exact_mentions(Query)};
+        :return: the set of indices of the candidate predicates or {@code null}
+                if the query does not restrict them or no predicate
+                satisfies all the restrictions.
+        """
+        if self.__verb_names is None:
+            self.__build_fact_index()
+        postings = []
+        for q_arg in query.predicate_arguments:
+            if q_arg.exact_concepts:
+                postings.append(RDUniverse.__merge_postings(
+                    [self.__concept_facts.get(conc.get_concept_id(), array("i"))
+                     for conc in q_arg.exact_concepts]))
+        if query.query_type in RDUniverse.QTYPE_CTYPES:
+            postings.append(self.__type_facts.get(RDUniverse.QTYPE_CTYPES[query.query_type], array("i")))
+        if not postings:
+            return None
+        # Smallest posting list first
+        postings.sort(key=len)
+        result = set(postings[0])
+        for facts in postings[1:]:
+            if not result:
+                break
+            result.intersection_update(facts)
+        return result if result else None
+
+    def get_vocabulary(self):
+        """
+        <p>Collects the words of this universe that are looked up
+        in WordNet: concept names and their synonyms, predicate names
+        and their synonyms and the content lemmas of the concept references.</p>
+        :return: the list of words, without duplicates.
+        """
+        words = {}
+        for conc in self.concepts:
+            if conc.get_canonical_name() is not None:
+                words[conc.get_canonical_name()] = True
+                for syn in conc.get_synonyms():
+                    words[syn] = True
+            for tok in conc.get_tokenized_reference():
+                if not self.lexicon.is_functional_pos(tok.POS):
+                    words[tok.lemma] = True
+        for pred in self.get_predicate_definitions():
+            words[pred.get_action_verb()] = True
+            for syn in pred.get_synonyms():
+                words[syn] = True
+        return list(words)
+
+    def get_query_vocabulary(self, query):
+        """
+        <p>Collects the words of a query that are looked up in WordNet:
+        the action verb and the content lemmas and word forms of the arguments.</p>
+        :param query: the parsed {@link Query} object;
+        :return: the list of words, without duplicates.
+        """
+        words = {}
+        if query.action_verb is not None:
+            words[query.action_verb.strip().lower()] = True
+        for q_arg in query.predicate_arguments:
+            for tok in q_arg.arg_tokens:
+                if not self.lexicon.is_functional_pos(tok.POS):
+                    words[tok.lemma.strip().lower()] = True
+                    words[tok.wform.strip().lower()] = True
+        return list(words)
+
+    def build_indexes(self):
+        """
+        <p>Builds the predicate and concept name indexes, so that recognizing
+        a user's word needs only its own WordNet record. Call it after the micro-world
+        is loaded and its vocabulary is fetched from WordNet; otherwise,
+        the indexes are built when the first query is resolved.</p>
+        :return:
+        """
+        self.__build_fact_index()
+        self.__verb_names.build(self.word_net_max_hops)
+        self.__concept_names.build(self.word_net_max_hops)
+
+    def warm_up(self, words):
+        """
+        <p>Speculatively fetches from WordNet the words the user already said
+        and runs the predicate and concept recognizers on them, so that
+        both are cached by the time the final query has to be resolved.</p>
+        :param words: list of (lower-cased) words from a partial user input.
+        :return:
+        """
+        if self.__verb_names is None:
+            self.__build_fact_index()
+        if self.word_net is not None:
+            self.word_net.prefetch(words)
+        for word in words:
+            self.__verb_names.lookup(word, self.word_net_max_hops)
+            self.__concept_names.lookup(word, self.word_net_max_hops)
 
     def resolve_query(self, query):
         """
@@ -89,14 +364,180 @@ class RDUniverse:
                 {@code null} if no predicate matched. It's safe to say that
                 the information is not in the Knowledge Base in this case.
         """
-        result = None
-        max_score = 0.0
-        for pred in self.predicates:
-            pm = self.score_query_against_predicate(query, pred)
-            if pm is not None and pm.match_score > max_score:
-                result = pm
-                max_score = pm.match_score
-        return result
+        result = self.resolve_query_top_k(query, 1)
+        return result[0] if result else None
+
+    # Rounding errors allowed when comparing a score to an upper bound.
+    SCORE_EPSILON = 1e-9
+
+    def resolve_query_top_k(self, query, k):
+        """
+        <p>Finds the {@code k} predicates which best match the query, e.g. to
+        ask the user which one they meant. Predicates are scored in the decreasing
+        order of an upper bound of their score, which is cheap to compute, and
+        scoring stops when the bound cannot beat the k-th best score.</p>
+        :param query: the parsed {@link Query} object from the
+                    user utterance;
+        :param k: the maximum number of predicate matches to return;
+        :return: the list of at most {@code k} predicate match objects with a
+                positive score, best first; equal scores are in the order of
+                {@link #get_universe_predicates()}.
+        """
+        self.bind_exact_mentions(query)
+        # One parallel wave of WordNet lookups instead
+        # of many serial ones while scoring.
+        if self.word_net is not None:
+            self.word_net.prefetch(self.get_query_vocabulary(query))
+        facts = self.__verb_fact_ids(query.action_verb)
+        candidates = self.get_candidate_facts(query)
+        if candidates is not None and not candidates.isdisjoint(facts):
+            facts = [f for f in facts if f in candidates]
+
+        if numpy is not None and len(facts) >= RDUniverse.VECTOR_MIN_FACTS:
+            return self.__vector_top_k(query, facts, k)
+
+        query_lengths = [self.text_processor.no_functional_words_length(q_arg.arg_tokens)
+                         for q_arg in query.predicate_arguments]
+        query_names = [self.__description_names(q_arg.arg_tokens) for q_arg in query.predicate_arguments]
+        bounds = [(self.__score_upper_bound(query, self.predicates[f], query_lengths, query_names), f)
+                  for f in facts]
+        # Highest bound first, then in the original order
+        bounds.sort(key=lambda bf: (-bf[0], bf[1]))
+        # (score, fact index, predicate match), k best
+        best = []
+        for bound, f in bounds:
+            if len(best) >= k and bound + RDUniverse.SCORE_EPSILON < best[-1][0]:
+                break
+            pm = self.score_query_against_predicate(query, self.predicates[f], True)
+            if pm is not None and pm.match_score > 0.0:
+                best.append((pm.match_score, f, pm))
+                best.sort(key=lambda sfp: (-sfp[0], sfp[1]))
+                del best[k:]
+        return [pm for score, f, pm in best]
+
+    # From this number of candidate predicates on, they are scored with NumPy.
+    VECTOR_MIN_FACTS = 32
+
+    def __vector_top_k(self, query, facts, k):
+        """
+        <p>The score of a predicate argument does not depend on the predicate, see
+        {@link #argument_score(Query, RDConcept)}. Each distinct argument of the
+        candidate predicates is scored once, then the scores of all the candidates
+        are gathered and summed over the CSR argument arrays of the fact base.</p>
+        """
+        # Views of the CSR arrays of the fact base, not copies
+        indptr = numpy.frombuffer(self.predicates.get_argument_indptr(), dtype=numpy.intc)
+        indices = numpy.frombuffer(self.predicates.get_argument_indices(), dtype=numpy.intc)
+        fact_ids = numpy.array(facts, dtype=numpy.intp)
+        starts = indptr[fact_ids]
+        lengths = indptr[fact_ids + 1] - starts
+        # The positions of the arguments of the candidates in the CSR arrays
+        positions = numpy.repeat(starts + lengths - numpy.cumsum(lengths), lengths) + numpy.arange(lengths.sum())
+        # Argument index -> score
+        arg_scores = numpy.zeros(len(self.__fact_concepts))
+        for c in numpy.unique(indices[positions]).tolist():
+            arg_scores[c] = self.argument_score(query, self.__fact_concepts[c])[0]
+        # Summed in the argument order, as score_query_against_predicate() does.
+        scores = numpy.ones(len(facts))
+        for column in range(int(lengths.max(initial=0))):
+            rows = numpy.flatnonzero(lengths > column)
+            scores[rows] += arg_scores[indices[starts[rows] + column]]
+        # Best score first, then in the original order
+        best = numpy.lexsort((fact_ids, -scores))[:k]
+        return [self.score_query_against_predicate(query, self.predicates[facts[b]], True)
+                for b in best.tolist()]
+
+    def __description_names(self, user_tokens):
+        """
+        <p>The ids of the concept names that a user description refers to,
+        see {@link #is_concept_instance(List, RDConcept)}.</p>
+        """
+        names = set()
+        for tok in user_tokens:
+            if tok.is_action_verb_dependent and not self.lexicon.is_functional_pos(tok.POS):
+                names.update(self.__concept_names.lookup(tok.lemma, self.word_net_max_hops))
+                names.update(self.__concept_names.lookup(tok.wform, self.word_net_max_hops))
+        return names
+
+    def __score_upper_bound(self, query, pred, query_lengths, query_names):
+        """
+        <p>An upper bound of the score of
+        {@link #score_query_against_predicate(Query, RDPredicate)}.
+        A fuzzy matched argument scores at most 2r/(r + d), where r and d are
+        the numbers of content words of the user's description and of the
+        concept reference, all aligned at distance 0. It is computed from the
+        types, the exact bindings and the name index, without WordNet.</p>
+        """
+        pred_args = pred.get_arguments()
+        query_args = query.predicate_arguments
+        cell_bounds = [[0.0] * len(query_args) for i in range(len(pred_args))]
+        for i, p_arg in enumerate(pred_args):
+            if p_arg.get_canonical_name() is None:
+                name = None
+            else:
+                name = self.__concept_names.name_id(p_arg.get_canonical_name(), p_arg.get_synonyms())
+            for j, q_arg in enumerate(query_args):
+                if q_arg.is_query_variable and self.is_of_same_type(p_arg, q_arg, query.query_type):
+                    cell_bounds[i][j] = 1.0
+                elif q_arg.exact_concepts:
+                    if p_arg in q_arg.exact_concepts:
+                        cell_bounds[i][j] = 1.0
+                elif name is not None and (name < 0 or name in query_names[j]):
+                    # A name that is not indexed may still match.
+                    r = query_lengths[j]
+                    d = p_arg.get_reference_features(self.lexicon).length
+                    cell_bounds[i][j] = 2.0 * r / (r + d) if r + d > 0 else 0.0
+        bound = 1.0
+        for i in range(len(pred_args)):
+            bound += max(cell_bounds[i], default=0.0)
+        return bound
+
+    async def aresolve_query(self, query):
+        """
+        <p>Same as {@link #resolve_query(Query)}, but all the WordNet checks
+        that scoring may need are resolved together, concurrently, first.</p>
+        :param query: the parsed {@link Query} object from the
+                    user utterance;
+        :return: the predicate match object which best matches the query.
+        """
+        self.bind_exact_mentions(query)
+        if self.word_net is not None:
+            await self.word_net.aword_net_equals_many(self.get_word_net_pairs(query))
+        return self.resolve_query(query)
+
+    def get_word_net_pairs(self, query):
+        """
+        <p>Collects the {@link WordNet#word_net_equals(String, String)} checks
+        that scoring the query against this universe may do.</p>
+        :param query: the parsed {@link Query} object;
+        :return: the list of (w1, w2) word pairs, without duplicates.
+        """
+        pairs = {}
+        if query.action_verb is not None:
+            verb = query.action_verb.strip().lower()
+            for pred in self.get_predicate_definitions():
+                pairs[(verb, pred.get_action_verb())] = True
+        canonical_forms = {}
+        reference_lemmas = {}
+        for conc in self.concepts:
+            if conc.get_canonical_name() is not None:
+                canonical_forms[conc.get_canonical_name()] = True
+                for tok in conc.get_tokenized_reference():
+                    if not self.lexicon.is_functional_pos(tok.POS):
+                        reference_lemmas[tok.lemma] = True
+        for q_arg in query.predicate_arguments:
+            if q_arg.exact_concepts:
+                continue
+            for tok in q_arg.arg_tokens:
+                if self.lexicon.is_functional_pos(tok.POS):
+                    continue
+                if tok.is_action_verb_dependent:
+                    for cform in canonical_forms:
+                        pairs[(tok.lemma.strip().lower(), cform)] = True
+                        pairs[(tok.wform.strip().lower(), cform)] = True
+                for lemma in reference_lemmas:
+                    pairs[(lemma, tok.lemma)] = True
+        return list(pairs)
 
     def resolve_query_in_context(self, query, pred):
         """
@@ -111,7 +552,7 @@ class RDUniverse:
                 a new predicate match if new information could be extracted.
         """
         # 1. Match the action verb of the query with the one of the predicate
-        if not pred.is_this_predicate(query.action_verb, self.word_net):
+        if not pred.is_this_predicate(query.action_verb, self.word_net, self.word_net_max_hops):
             return None
         # Predicate bound arguments
         pred_args = pred.get_arguments()
@@ -135,6 +576,18 @@ class RDUniverse:
             return result
         return None
 
+    def bind_exact_mentions(self, query):
+        """
+        <p>Binds the query arguments that mention a concept reference
+        exactly (e.g. <i>sala de consiliu</i>) to that concept, so that
+        they are not fuzzy scored against the bound concepts.</p>
+        :param query: the parsed {@link Query} object;
+        :return:
+        """
+        for q_arg in query.predicate_arguments:
+            if q_arg.exact_concepts is None:
+                q_arg.exact_concepts = self.gazetteer.mentioned_concepts(q_arg.arg_tokens)
+
     def is_concept_instance(self, user_tokens, bound_concept):
         """
         <p>Verifies if the user description of a concept matches
@@ -143,78 +596,69 @@ class RDUniverse:
         :param bound_concept: the target bound concept to do the matching against.
         :return: {@code true} if description matches the concept.
         """
+        if bound_concept.get_canonical_name() is None:
+            return False
+        name = self.__concept_names.name_id(bound_concept.get_canonical_name(), bound_concept.get_synonyms())
         for tok in user_tokens:
             if tok.is_action_verb_dependent and not self.lexicon.is_functional_pos(tok.POS):
-                if bound_concept.is_this_concept(tok.lemma, self.word_net) \
-                        or bound_concept.is_this_concept(tok.wform, self.word_net):
+                if name >= 0:
+                    if name in self.__concept_names.lookup(tok.lemma, self.word_net_max_hops) \
+                            or name in self.__concept_names.lookup(tok.wform, self.word_net_max_hops):
+                        return True
+                elif bound_concept.is_this_concept(tok.lemma, self.word_net, self.word_net_max_hops) \
+                        or bound_concept.is_this_concept(tok.wform, self.word_net, self.word_net_max_hops):
                     return True
         return False
 
-    def score_query_against_predicate(self, query, pred):
+    def score_query_against_predicate(self, query, pred, verb_matched=False):
         # 1. Match the action verb of the query with the one of the predicate
-        if not pred.is_this_predicate(query.action_verb, self.word_net):
+        if not verb_matched and \
+                not pred.is_this_predicate(query.action_verb, self.word_net, self.word_net_max_hops):
             return None
 
         # Match the syntactic arguments with logical (bound) arguments
-        # Predicate bound arguments
-        pred_args = pred.get_arguments()
-        # User query tokens making up syntactic arguments of the verb
-        query_args = query.predicate_arguments
-        """
-        Find the maximal sum assignment of query arguments
-        to predicate arguments
-        Matrix is symmetrical
-        """
-        match_scores = [[0]*len(query_args) for i in range(len(pred_args))]
-        ij_pairs = set()
-        i = 0
-        while i < len(pred_args):
-            p_arg = pred_args[i]
-            j = 0
-            while j < len(query_args):
-                q_arg = query_args[j]
-                q_arg_toks = query_args[j].arg_tokens
-                match_scores[i][j] = 0.0
-                if (str(j) + "#" + str(i)) in ij_pairs:
-                    # Matrix is symmetrical, where it can.
-                    match_scores[i][j] = match_scores[j][i]
-                elif q_arg.is_query_variable and self.is_of_same_type(p_arg, q_arg, query.query_type):
-                    """
-                    A query type that matches argument
-                    is counted as a argument match.
-                    """
-                    match_scores[i][j] = float(1.0)
-                    ij_pairs.add(str(i) + "#" + str(j))
-                elif self.is_concept_instance(q_arg_toks, p_arg):
-                    # Else, the argument is fuzzy scored against user's description.
-                    match_scores[i][j] = self.description_similarity(p_arg.get_tokenized_reference(), q_arg_toks)
-                    ij_pairs.add(str(i) + "#" + str(j))
-                j += 1
-            i += 1
         result = RDPredicate.PMatch(pred)
         # Predicate has matched, at least with its name.
         result.match_score = 1.0
-        i = 0
-        while i < len(pred_args):
-            p_arg = pred_args[i]
-            max_score = 0.0
-            j = 0
-            while j < len(query_args):
-                q_arg = query_args[j]
-                if match_scores[i][j] > max_score:
-                    max_score = match_scores[i][j]
-                if q_arg.is_query_variable and\
-                        self.is_of_same_type(p_arg, q_arg, query.query_type) and\
-                        result.said_argument_index == -1:
-                    result.said_argument_index = i
-                j += 1
+        for i, p_arg in enumerate(pred.get_arguments()):
+            max_score, asked = self.argument_score(query, p_arg)
+            if asked and result.said_argument_index == -1:
+                result.said_argument_index = i
             result.match_score += max_score
             result.arg_match_scores[i] = max_score
-            i += 1
         # 1.0 for the predicate name and 1.0 of the query variable.
         result.is_valid_match = (result.match_score > 2.0)
         return result
 
+    def argument_score(self, query, p_arg):
+        """
+        <p>Scores a predicate argument against the arguments of the query.
+        The score does not depend on the predicate, only on the concept.</p>
+        :param query: the parsed {@link Query} object;
+        :param p_arg: the predicate argument (bound concept);
+        :return: (the best score over the query arguments, {@code true}
+                if a query variable asks for this argument).
+        """
+        max_score = 0.0
+        asked = False
+        for q_arg in query.predicate_arguments:
+            score = 0.0
+            if q_arg.is_query_variable and self.is_of_same_type(p_arg, q_arg, query.query_type):
+                # A query type that matches argument
+                # is counted as a argument match.
+                score = 1.0
+                asked = True
+            elif q_arg.exact_concepts:
+                # The argument names a bound concept exactly.
+                if p_arg in q_arg.exact_concepts:
+                    score = 1.0
+            elif self.is_concept_instance(q_arg.arg_tokens, p_arg):
+                # Else, the argument is fuzzy scored against user's description.
+                score = self.concept_similarity(p_arg, q_arg.arg_tokens)
+            if score > max_score:
+                max_score = score
+        return max_score, asked
+
     def is_of_same_type(self, con, arg, qtyp):
         """
         <p>Will say {@code true} if this concept is of the same type
@@ -238,6 +682,55 @@ class RDUniverse:
 
         return False
 
+    # The maximum Levenshtein distance for two words to be similar.
+    MAX_WORD_DISTANCE = 5
+    # The maximum number of memoized neighbourhoods of user's words.
+    NEIGHBOURS_MEMO_SIZE = 10000
+    # From this number of reference words on, with NumPy, the neighbours
+    # farther than 1 edit are found with one batch computation over all
+    # the reference words, which is faster than the BK-tree search.
+    BATCH_MIN_VOCABULARY = 500
+
+    @staticmethod
+    def word_radius(word):
+        """
+        <p>How far a word can be from a similar word: a quarter of its length,
+        at least 1 and at most {@link #MAX_WORD_DISTANCE}. A small radius
+        keeps the BK-tree search from visiting the whole tree. Words that
+        are farther count as {@code MAX_WORD_DISTANCE + 1} away when
+        descriptions are scored, see {@link #features_similarity}.</p>
+        :param word: the word;
+        :return: the maximum Levenshtein distance of the similar words.
+        """
+        return max(1, min(RDUniverse.MAX_WORD_DISTANCE, len(word) // 4))
+
+    def get_word_neighbours(self, word):
+        """
+        <p>Finds the concept reference words that are close to a user's word,
+        with one search of the reference words: in the BK-tree or, see
+        {@link #BATCH_MIN_VOCABULARY}, with {@link Levenshtein#neighbours(String, Batch, int)}.
+        The neighbourhoods of the last {@link #NEIGHBOURS_MEMO_SIZE} words are memoized.</p>
+        :param word: the lower-cased word;
+        :return: a dictionary of the reference words within
+                {@link #word_radius(String)} of {@code word} to their distance.
+        """
+        neighbours = self.__word_neighbours.get(word)
+        if neighbours is not None:
+            self.__word_neighbours.move_to_end(word)
+            return neighbours
+        radius = RDUniverse.word_radius(word)
+        if numpy is not None and radius > 1 and \
+                len(self.__reference_word_list) >= RDUniverse.BATCH_MIN_VOCABULARY:
+            if self.__reference_batch is None:
+                self.__reference_batch = Levenshtein.Batch(self.__reference_word_list)
+            neighbours = self.word_distance.neighbours(word, self.__reference_batch, radius)
+        else:
+            neighbours = self.reference_words.find(word, radius)
+        self.__word_neighbours[word] = neighbours
+        while len(self.__word_neighbours) > RDUniverse.NEIGHBOURS_MEMO_SIZE:
+            self.__word_neighbours.popitem(last=False)
+        return neighbours
+
     def description_similarity(self, description, reference):
         """
         <p>Detects if two lists of words are ``similar''. Word matching
@@ -252,45 +745,91 @@ class RDUniverse:
         are exactly equal and less than 1 for a degree of
         similarity.
         """
+        return self.features_similarity(RDConcept.ReferenceFeatures(description, self.lexicon),
+                                        RDConcept.ReferenceFeatures(reference, self.lexicon))
+
+    # The maximum number of memoized concept similarities.
+    SIMILARITY_MEMO_SIZE = 100000
+
+    def concept_similarity(self, conc, user_tokens):
+        """
+        <p>The {@link #description_similarity(List, List)} of the reference of a concept
+        and a user's description. Concepts appear in many predicates, so the
+        score of each (concept, description) pair is memoized, across turns.</p>
+        :param conc: the bound concept;
+        :param user_tokens: the user description of the concept;
+        :return: the similarity score.
+        """
+        concept_id = conc.get_concept_id()
+        if conc.get_concept_universe() is not self:
+            # Not added to this universe, so it cannot be memoized.
+            return self.features_similarity(conc.get_reference_features(self.lexicon),
+                                            RDConcept.ReferenceFeatures(user_tokens, self.lexicon))
+        key = (concept_id, tuple([(tok.wform, tok.lemma, tok.POS) for tok in user_tokens]))
+        score = self.__similarity_memo.get(key)
+        if score is not None:
+            self.__similarity_memo.move_to_end(key)
+            self.__similarity_hits += 1
+            return score
+        self.__similarity_misses += 1
+        score = self.features_similarity(conc.get_reference_features(self.lexicon),
+                                         RDConcept.ReferenceFeatures(user_tokens, self.lexicon))
+        self.__similarity_memo[key] = score
+        while len(self.__similarity_memo) > RDUniverse.SIMILARITY_MEMO_SIZE:
+            self.__similarity_memo.popitem(last=False)
+        return score
+
+    def similarity_stats(self):
+        """
+        :return: a dictionary with the number of hits, misses
+                and the size of the concept similarity memo.
+        """
+        return {"hits": self.__similarity_hits, "misses": self.__similarity_misses,
+                "size": len(self.__similarity_memo)}
+
+    def features_similarity(self, description, reference):
+        """
+        <p>The {@link #description_similarity(List, List)} of two lists
+        of words, given their precomputed {@link RDConcept.ReferenceFeatures}.</p>
+        :param description: the features of the description tokens;
+        :param reference: the features of the reference tokens;
+        :return: the similarity score.
+        """
         sum = 0
-        d_len = self.text_processor.no_functional_words_length(description)
-        r_len = self.text_processor.no_functional_words_length(reference)
-
-        i = 0
-        while i < len(description):
-            L = 1000
-            j = len(reference)
-            li = description[i].lemma
-            wi = description[i].wform
-
-            if self.lexicon.is_functional_pos(description[i].POS):
-                i += 1
-                continue
-            jj = 0
-            while jj < len(reference):
-                if self.lexicon.is_functional_pos(reference[jj].POS):
-                    # Skip functional words from match.
-                    jj += 1
-                    continue
-                wjj = reference[jj].wform
-                ljj = reference[jj].lemma
-
-                if li.lower() == ljj.lower() or self.word_net.word_net_equals(li, ljj):
-                    L = 0
-                    j = jj
-                    jj += 1
-                    break
-                else:
-                    d = self.word_distance.distance(wi.lower(), wjj.lower(), 5)
-                    if d < L:
+        for di, i in enumerate(description.positions):
+            # The first reference word with the same lemma or with a lemma
+            # that is a WordNet neighbour, from the smaller of the two sets.
+            rj = reference.lower_lemma_index.get(description.lower_lemmas[di])
+            if self.word_net is not None:
+                wn_neighbours = self.word_net.get_record(description.lemmas[di]).neighbours
+            else:
+                wn_neighbours = ()
+            if len(wn_neighbours) < len(reference.lemma_index):
+                related = [reference.lemma_index[lemma] for lemma in wn_neighbours
+                           if lemma in reference.lemma_index]
+            else:
+                related = [rk for lemma, rk in reference.lemma_index.items() if lemma in wn_neighbours]
+            if rj is not None:
+                related.append(rj)
+            if related:
+                L = 0
+                rj = min(related)
+            elif reference.length > 0:
+                # The closest reference word, the first one if there are more;
+                # only the neighbours of the word can be closer than this.
+                L = RDUniverse.MAX_WORD_DISTANCE + 1
+                rj = 0
+                for wform, d in self.get_word_neighbours(description.lower_wforms[di]).items():
+                    rk = reference.wform_index.get(wform)
+                    if rk is not None and (d < L or (d == L and rk < rj)):
                         L = d
-                        j = jj
-                jj += 1
-            # end jj
+                        rj = rk
+            else:
+                L = 1000
+            j = reference.positions[rj] if rj is not None else reference.size
             sum += (abs(i - j) + 1) * (L + 1)
-            i += 1
         # end i
-        d_score = float(sum) / float(d_len)
-        r_score = float(sum) / float(r_len)
+        d_score = float(sum) / float(description.length)
+        r_score = float(sum) / float(reference.length)
 
         return 2.0/(d_score + r_score)
\ No newline at end of file
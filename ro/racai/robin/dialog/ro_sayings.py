@@ -1,4 +1,5 @@
 from ro.racai.robin.dialog.rd_sayings import RDSayings
+from ro.racai.robin.nlp.aho_corasick import AhoCorasick
 import re
 
 
@@ -32,22 +33,45 @@ def init_opening_lines(closing_set):
     closing_set.add("servus pepper")
 
 
+def init_filler_words(filler_set):
+    # Words that may accompany an opening or
+    # closing line, e.g. "mulțumesc frumos".
+    filler_set.update(["te", "vă", "rog", "mult", "frumos", "foarte",
+                       "și", "tu", "dragă", "ce", "mai", "faci", "faceți"])
+
+
+def init_matcher(lines):
+    matcher = AhoCorasick()
+    for line in lines:
+        matcher.add_pattern(tuple(line.split()), line)
+    return matcher
+
+
 class RoSayings(RDSayings):
     """
-    <p>Romanian version.</p>
+    <p>Romanian version. Opening and closing lines are found anywhere in
+    the user's words with a multi-phrase automaton; the words that are
+    not part of such a line must be filler words.</p>
     """
 
     OPENING_LINES = set()
     CLOSING_LINES = set()
+    FILLER_WORDS = set()
 
     init_opening_lines(OPENING_LINES)
     init_closing_lines(CLOSING_LINES)
+    init_filler_words(FILLER_WORDS)
+
+    OPENING_MATCHER = init_matcher(OPENING_LINES)
+    CLOSING_MATCHER = init_matcher(CLOSING_LINES)
+
+    PUNCTUATION_PATT = re.compile(r'^\W+$')
 
     def user_opening_statement(self, words):
-        return RoSayings.filter_words(words) in RoSayings.OPENING_LINES
+        return RoSayings.is_statement(RoSayings.OPENING_MATCHER, words)
 
     def user_closing_statement(self, words):
-        return RoSayings.filter_words(words) in RoSayings.CLOSING_LINES
+        return RoSayings.is_statement(RoSayings.CLOSING_MATCHER, words)
 
     def robot_opening_lines(self):
         return ["Bună ziua!", "Cu ce vă pot ajuta?"]
@@ -61,10 +85,37 @@ class RoSayings(RDSayings):
     def robot_didnt_understand_lines(self):
         return ["Nu am înțeles ce ați întrebat.", "Vă rog să reformulați."]
 
+    @staticmethod
+    def is_statement(matcher, words):
+        """
+        <p>Checks if the words contain a line of the {@code matcher}
+        and, apart from these lines, only filler words.</p>
+        :param matcher: the automaton of opening or closing lines;
+        :param words: the user's words;
+        :return: {@code true} if words make up the statement.
+        """
+        words = RoSayings.filter_words(words).split()
+        if not words:
+            return False
+        covered = [False] * len(words)
+        for start, end, line in matcher.find_all(words):
+            i = start
+            while i < end:
+                covered[i] = True
+                i += 1
+        if not any(covered):
+            return False
+        i = 0
+        while i < len(words):
+            if not covered[i] and words[i] not in RoSayings.FILLER_WORDS:
+                return False
+            i += 1
+        return True
+
     @staticmethod
     def filter_words(words):
         matched_words = []
         for word in words:
-            if not re.match(r'^\W+$', word):
+            if not RoSayings.PUNCTUATION_PATT.match(word):
                 matched_words.append(word.strip().lower())
         return " ".join(matched_words)
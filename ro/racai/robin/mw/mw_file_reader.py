@@ -6,6 +6,7 @@ from ro.racai.robin.dialog.ctype import CType
 from ro.racai.robin.dialog.ctype import get_member_regex
 from ro.racai.robin.dialog.rd_concept import RDConcept
 from ro.racai.robin.dialog.rd_constant import RDConstant
+from ro.racai.robin.dialog.rd_fact_base import RDFactBase
 from ro.racai.robin.dialog.rd_predicate import RDPredicate
 from ro.racai.robin.dialog.rd_universe import RDUniverse
 from ro.racai.robin.dialog.u_intent_type import UIntentType
@@ -45,7 +46,9 @@ class MWFileReader(RDMicroworld):
         defined_concepts = []
         defined_predicates = []
         referenced_concepts = {}
-        true_predicates = []
+        # Interns the arguments of the facts, as they are read.
+        universe = RDUniverse(word_net, lexicon, text_processor)
+        true_predicates = RDFactBase()
 
         line_count = 1
 
@@ -163,13 +166,14 @@ class MWFileReader(RDMicroworld):
 
                 for p in defined_predicates:
                     if p.get_action_verb().lower() == action_verb.lower():
-                        np = p.deep_copy()
-                        # Add arguments to the predicate
+                        # Arguments of the fact, which shares the definition of the predicate
+                        arguments = []
                         index = 2
                         while index < len(true_parts):
                             ref_code = true_parts[index]
                             if ref_code in referenced_concepts:
-                                np.add_argument(referenced_concepts[ref_code])
+                                universe.intern_concept(referenced_concepts[ref_code])
+                                arguments.append(referenced_concepts[ref_code])
                             else:
                                 logging.error("Reference code '" + ref_code +
                                               "' was not declared before at " + str(line_count) + "!")
@@ -178,7 +182,7 @@ class MWFileReader(RDMicroworld):
                             index += 1
                             # end all arguments
                         predicate_found = True
-                        true_predicates.append(np)
+                        true_predicates.add_fact(p, arguments)
                         break
                     # end predicate found
                 # end all defined predicates
@@ -192,7 +196,6 @@ class MWFileReader(RDMicroworld):
             line_count += 1
         # end all .mw file
         rdr.close()
-        universe = RDUniverse(word_net, lexicon, text_processor)
         universe.add_predicates(true_predicates)
         for ref in referenced_concepts:
             universe.add_concept(referenced_concepts[ref])
@@ -0,0 +1,90 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    <p>Aho-Corasick automaton over sequences of symbols, e.g. the
+    characters of a string or the words of a sentence. All the added
+    patterns are found in a text with a single left-to-right scan.</p>
+    """
+
+    def __init__(self):
+        # Trie transitions, one dictionary per state.
+        self.__goto = [{}]
+        # Failure links, one per state.
+        self.__fail = [0]
+        # (pattern length, value) pairs that end in each state.
+        self.__output = [[]]
+        self.__compiled = True
+
+    def add_pattern(self, pattern, value):
+        """
+        <p>Adds a pattern to this automaton.</p>
+        :param pattern: a non-empty sequence of symbols;
+        :param value: the value reported when the pattern is found.
+        :return:
+        """
+        if not pattern:
+            raise RuntimeError("Pattern cannot be empty!")
+        state = 0
+        for sym in pattern:
+            if sym not in self.__goto[state]:
+                self.__goto.append({})
+                self.__fail.append(0)
+                self.__output.append([])
+                self.__goto[state][sym] = len(self.__goto) - 1
+            state = self.__goto[state][sym]
+        self.__output[state].append((len(pattern), value))
+        self.__compiled = False
+
+    def __compile(self):
+        queue = deque()
+        for state in self.__goto[0].values():
+            self.__fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for sym, next_state in self.__goto[state].items():
+                queue.append(next_state)
+                fail = self.__fail[state]
+                while fail > 0 and sym not in self.__goto[fail]:
+                    fail = self.__fail[fail]
+                fail = self.__goto[fail].get(sym, 0)
+                self.__fail[next_state] = fail
+                self.__output[next_state] = self.__output[next_state] + self.__output[fail]
+        self.__compiled = True
+
+    def find_all(self, text):
+        """
+        <p>Finds all (possibly overlapping) occurrences of the patterns.</p>
+        :param text: the sequence of symbols to search in;
+        :return: a list of (start, end, value) triples, {@code end} exclusive.
+        """
+        if not self.__compiled:
+            self.__compile()
+        result = []
+        state = 0
+        for i, sym in enumerate(text):
+            while state > 0 and sym not in self.__goto[state]:
+                state = self.__fail[state]
+            state = self.__goto[state].get(sym, 0)
+            for length, value in self.__output[state]:
+                result.append((i + 1 - length, i + 1, value))
+        return result
+
+    def find_longest(self, text):
+        """
+        <p>Finds the leftmost-longest, non-overlapping occurrences of the patterns.</p>
+        :param text: the sequence of symbols to search in;
+        :return: a list of (start, end, value) triples, sorted by {@code start}.
+        """
+        result = []
+        end = 0
+        for match in sorted(self.find_all(text), key=lambda m: (m[0], m[0] - m[1])):
+            if match[0] >= end:
+                result.append(match)
+                end = match[1]
+        return result
+
+    def is_empty(self):
+        return len(self.__goto) == 1
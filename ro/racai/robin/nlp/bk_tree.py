@@ -0,0 +1,69 @@
+class BKTree:
+    """
+    <p>A Burkhard-Keller tree: a metric index of words that finds all
+    the words within a given edit distance of a query word without
+    comparing the query word to every indexed word.</p>
+    <p>The children of a node are keyed by their distance to the node.
+    By the triangle inequality, if the query word is at distance
+    {@code d} from a node, the words within distance {@code k} of the
+    query word can only be under the children keyed {@code d - k .. d + k}.</p>
+    """
+
+    def __init__(self, word_distance):
+        """
+        :param word_distance: the {@link Levenshtein} object to compute
+                    (bounded) distances with.
+        """
+        self.__word_distance = word_distance
+        # Node: [word, {distance -> child node}]
+        self.__root = None
+        self.__words = set()
+
+    def __len__(self):
+        return len(self.__words)
+
+    def __contains__(self, word):
+        return word in self.__words
+
+    def add(self, word):
+        """
+        <p>Adds a word to the index. Adding a word twice has no effect.</p>
+        :param word: the word to add.
+        :return:
+        """
+        if word in self.__words:
+            return
+        self.__words.add(word)
+        if self.__root is None:
+            self.__root = [word, {}]
+            return
+        node = self.__root
+        while True:
+            d = self.__word_distance.distance(word, node[0], -1)
+            if d not in node[1]:
+                node[1][d] = [word, {}]
+                return
+            node = node[1][d]
+
+    def find(self, word, max_n):
+        """
+        <p>Finds the indexed words within an edit distance of a word.</p>
+        :param word: the word to search for;
+        :param max_n: the maximum distance;
+        :return: a dictionary of the found words to their distance to {@code word}.
+        """
+        result = {}
+        if self.__root is None:
+            return result
+        stack = [self.__root]
+        while stack:
+            node_word, children = stack.pop()
+            # The exact distance is needed only for the range of the children keys.
+            bound = max_n + max(children) if children else max_n
+            d = self.__word_distance.distance(word, node_word, bound)
+            if d <= max_n:
+                result[node_word] = d
+            for child_d, child in children.items():
+                if d - max_n <= child_d <= d + max_n:
+                    stack.append(child)
+        return result
@@ -0,0 +1,116 @@
+import hashlib
+import math
+import struct
+import time
+
+
+class BloomFilter:
+    """
+    <p>A compact, probabilistic set of strings or (64-bit) integers.
+    Membership tests never miss an added key but may (rarely) report
+    a key that was not added, with the configured error rate.</p>
+    <p>The filter does not grow: past its capacity, the error rate rises
+    quickly, so a full filter should be replaced, see {@link #is_full()}.</p>
+    <p>Binary file layout, all numbers little-endian: header (magic,
+    number of hash functions, number of bits, number of added keys,
+    capacity, creation time) and the bits.</p>
+    """
+    MAGIC = b"BLF2"
+    HEADER = struct.Struct("<4sIQQQd")
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        """
+        :param capacity: the expected number of added keys;
+        :param error_rate: the false positive rate when {@code capacity}
+                    keys have been added.
+        """
+        if capacity <= 0 or not 0.0 < error_rate < 1.0:
+            raise RuntimeError("Capacity must be positive and error rate in (0, 1)!")
+        self.__bit_count = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.__hash_count = max(1, int(round(self.__bit_count / capacity * math.log(2))))
+        self.__bits = bytearray((self.__bit_count + 7) // 8)
+        self.__size = 0
+        self.__capacity = capacity
+        # When this filter was created, in seconds since the epoch
+        self.__created = time.time()
+
+    def __bit_positions(self, key):
+        if isinstance(key, int):
+            data = key.to_bytes(8, "little")
+        else:
+            data = key.encode("UTF-8")
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        # Double hashing: h1 + i * h2
+        for i in range(self.__hash_count):
+            yield (h1 + i * h2) % self.__bit_count
+
+    def add(self, key):
+        for position in self.__bit_positions(key):
+            self.__bits[position >> 3] |= 1 << (position & 7)
+        self.__size += 1
+
+    def __contains__(self, key):
+        for position in self.__bit_positions(key):
+            if not self.__bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        """
+        :return: the number of added keys, duplicates included.
+        """
+        return self.__size
+
+    def size_in_bytes(self):
+        return len(self.__bits)
+
+    def get_capacity(self):
+        return self.__capacity
+
+    def get_created(self):
+        """
+        :return: when this filter was created, in seconds since the epoch.
+        """
+        return self.__created
+
+    def is_full(self):
+        """
+        :return: {@code true} if as many keys as the capacity were added,
+                so the error rate is no longer the configured one.
+        """
+        return self.__size >= self.__capacity
+
+    def save(self, bloom_file):
+        """
+        <p>Writes the filter to a binary file.</p>
+        :param bloom_file: the file to write.
+        :return:
+        """
+        with open(bloom_file, "wb") as wrt:
+            wrt.write(BloomFilter.HEADER.pack(BloomFilter.MAGIC, self.__hash_count, self.__bit_count,
+                                              self.__size, self.__capacity, self.__created))
+            wrt.write(self.__bits)
+
+    def load(self, bloom_file):
+        """
+        <p>Replaces the contents of this filter with
+        a filter written by {@link #save(String)}.</p>
+        :param bloom_file: the file to read.
+        :return:
+        """
+        with open(bloom_file, "rb") as rdr:
+            data = rdr.read()
+        if len(data) < BloomFilter.HEADER.size:
+            raise RuntimeError("'" + bloom_file + "' is not a Bloom filter file!")
+        magic, hash_count, bit_count, size, capacity, created = BloomFilter.HEADER.unpack_from(data, 0)
+        if magic != BloomFilter.MAGIC or hash_count <= 0 or bit_count <= 0 or capacity <= 0 or \
+                len(data) != BloomFilter.HEADER.size + (bit_count + 7) // 8:
+            raise RuntimeError("'" + bloom_file + "' is not a Bloom filter file!")
+        self.__hash_count = hash_count
+        self.__bit_count = bit_count
+        self.__size = size
+        self.__capacity = capacity
+        self.__created = created
+        self.__bits = bytearray(data[BloomFilter.HEADER.size:])
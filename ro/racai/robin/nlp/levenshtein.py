@@ -1,13 +1,101 @@
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import numpy
+except ImportError:
+    # The batch distances are computed one by one.
+    numpy = None
+
+
 class Levenshtein:
     """
-    Taken from:<br/>
-    <a href="https://rosettacode.org/wiki/Levenshtein_distance#Iterative_space_optimized_.28even_bounded.29">
-    https://rosettacode.org/wiki/Levenshtein_distance#Iterative_space_optimized_.28even_bounded.29</a>.</br>
+    <p>Bounded Levenshtein distance, computed with the bit-parallel
+    algorithm of Myers, in the formulation of Hyyrö:<br/>
+    H. Hyyrö, <i>A bit-vector algorithm for computing Levenshtein and
+    Damerau edit distances</i>, Nordic Journal of Computing, 10(1), 2003.</p>
+    <p>A column of the dynamic programming matrix is kept as bit vectors
+    of vertical +1/-1 deltas, so each character of the text is processed
+    with a handful of integer operations.</p>
     Added cache for better performance.
     """
 
-    def __init__(self):
-        self.__levenshtein_cache = {}
+    def __init__(self, cache_size=100000):
+        """
+        :param cache_size: the maximum number of word pairs in the cache;
+                    the least recently used ones are evicted first.
+        """
+        # (a, b), a <= b, interned -> (distance, exact); a non exact distance
+        # is a lower bound, found when the computation was cut off.
+        self.__levenshtein_cache = OrderedDict()
+        self.__cache_size = cache_size
+        self.__cache_lock = threading.Lock()
+        self.__cache_hits = 0
+        self.__cache_misses = 0
+        # The scratch cache of the current thread, if inside a scratch scope.
+        self.__local = threading.local()
+
+    @contextmanager
+    def scratch_scope(self):
+        """
+        <p>Inside this scope, e.g. a dialogue turn, new word pairs go to a
+        scratch cache of the current thread, which is dropped at the end of the
+        scope. Pairs that were needed again during the scope are kept in the
+        long-lived cache. This way, one-off pairs with misrecognized words do
+        not evict useful pairs. Nested scopes share the outer scratch cache.</p>
+        """
+        if getattr(self.__local, "scratch", None) is not None:
+            yield
+            return
+        # Key -> [(distance, exact), needed again]
+        self.__local.scratch = {}
+        try:
+            yield
+        finally:
+            scratch = self.__local.scratch
+            self.__local.scratch = None
+            for key, (value, reused) in scratch.items():
+                if reused:
+                    self.__cache_put(key, value)
+
+    def cache_stats(self):
+        """
+        :return: a dictionary with the number of cache hits, misses
+                and the size of the long-lived cache.
+        """
+        with self.__cache_lock:
+            return {"hits": self.__cache_hits, "misses": self.__cache_misses,
+                    "size": len(self.__levenshtein_cache)}
+
+    def __cache_get(self, key):
+        scratch = getattr(self.__local, "scratch", None)
+        if scratch is not None and key in scratch:
+            scratch[key][1] = True
+            with self.__cache_lock:
+                self.__cache_hits += 1
+            return scratch[key][0]
+        with self.__cache_lock:
+            value = self.__levenshtein_cache.get(key)
+            if value is None:
+                self.__cache_misses += 1
+            else:
+                self.__cache_hits += 1
+                self.__levenshtein_cache.move_to_end(key)
+            return value
+
+    def __cache_put(self, key, value):
+        scratch = getattr(self.__local, "scratch", None)
+        if scratch is not None:
+            # Keep the reuse flag of a recomputed lower bound.
+            scratch[key] = [value, key in scratch and scratch[key][1]]
+            return
+        with self.__cache_lock:
+            self.__levenshtein_cache[key] = value
+            self.__levenshtein_cache.move_to_end(key)
+            if len(self.__levenshtein_cache) > self.__cache_size:
+                self.__levenshtein_cache.popitem(last=False)
 
     def ld(self, a, b, max_n=-1):
         distance_result = self.distance(a, b, max_n)
@@ -17,67 +105,213 @@ class Levenshtein:
             return distance_result <= max_n
 
     def distance(self, a, b, max_n):
-        keyab = a + "#" + b
-        keyba = b + "#" + a
+        """
+        <p>Computes the Levenshtein distance between two strings,
+        stopping as soon as it is known to exceed {@code max_n}.
+        Callers looking for the closest string can pass the best
+        distance so far (minus 1) as {@code max_n}, so that farther
+        strings are dismissed early.</p>
+        :param a: first string;
+        :param b: second string;
+        :param max_n: the maximum distance of interest or -1 for no bound;
+        :return: the distance between {@code a} and {@code b} or
+                {@code max_n + 1} if it is greater than {@code max_n}.
+        """
+        if a == b:
+            return 0
+        key = (sys.intern(a), sys.intern(b)) if a < b else (sys.intern(b), sys.intern(a))
 
-        if keyab in self.__levenshtein_cache:
-            return self.__levenshtein_cache[keyab]
+        cached = self.__cache_get(key)
+        if cached is not None:
+            dist, exact = cached
+            if 0 <= max_n < dist:
+                return max_n + 1
+            if exact:
+                return dist
 
-        if keyba in self.__levenshtein_cache:
-            return self.__levenshtein_cache[keyba]
+        dist, exact = Levenshtein.__bounded_distance(a, b, max_n)
+        self.__cache_put(key, (dist, exact))
+        if not exact:
+            return max_n + 1
+        if 0 <= max_n < dist:
+            return max_n + 1
+        return dist
 
-        if a == b:
-            self.__levenshtein_cache[keyab] = 0
-            return 0
+    # Fewer candidates than this are not worth the NumPy overhead.
+    BATCH_MIN_CANDIDATES = 16
+
+    class Batch:
+        """
+        <p>Candidate words encoded once for the batch distances, e.g. a whole
+        vocabulary: the indices of their characters in the alphabet of the
+        batch, padded with -1, and their lengths. Needs NumPy.</p>
+        """
 
+        def __init__(self, words):
+            """
+            :param words: the list of candidate words.
+            """
+            self.words = list(words)
+            self.lengths = numpy.array([len(w) for w in self.words], dtype=numpy.int64)
+            # The characters of the batch, sorted
+            self.alphabet = sorted(set("".join(self.words)))
+            char_ids = {c: k for k, c in enumerate(self.alphabet)}
+            self.chars = numpy.full((len(self.words), max(1, int(self.lengths.max(initial=0)))), -1,
+                                    dtype=numpy.int32)
+            for k, w in enumerate(self.words):
+                self.chars[k, :len(w)] = [char_ids[c] for c in w]
+
+        def __len__(self):
+            return len(self.words)
+
+    def distances(self, word, candidates, max_n):
+        """
+        <p>Computes the bounded distances between a word and many
+        candidate words. With NumPy, the bit-parallel algorithm runs
+        on all the candidates at once, one character position at a time.
+        The candidate pairs within {@code max_n} are added to the cache.</p>
+        :param word: the word to compare;
+        :param candidates: the list of words to compare {@code word} to
+                    or their {@link Batch};
+        :param max_n: the maximum distance of interest or -1 for no bound;
+        :return: the list of {@link #distance(String, String, int)} values,
+                in the order of {@code candidates}.
+        """
+        scores = self.__batch_scores(word, candidates, max_n)
+        if scores is None:
+            words = candidates.words if isinstance(candidates, Levenshtein.Batch) else candidates
+            return [self.distance(word, c, max_n) for c in words]
+        return scores.tolist()
+
+    def neighbours(self, word, candidates, max_n):
+        """
+        <p>Finds the candidate words within a distance of a word,
+        see {@link #distances(String, List, int)}.</p>
+        :param word: the word to compare;
+        :param candidates: the list of words to compare {@code word} to
+                    or their {@link Batch};
+        :param max_n: the maximum distance;
+        :return: a dictionary of the candidate words within
+                {@code max_n} of {@code word} to their distance.
+        """
+        scores = self.__batch_scores(word, candidates, max_n)
+        words = candidates.words if isinstance(candidates, Levenshtein.Batch) else candidates
+        if scores is None:
+            result = {}
+            for c in words:
+                d = self.distance(word, c, max_n)
+                if d <= max_n:
+                    result[c] = d
+            return result
+        return {words[k]: int(scores[k]) for k in numpy.flatnonzero(scores <= max_n).tolist()}
+
+    def __batch_scores(self, word, candidates, max_n):
+        """
+        :return: the NumPy array of the bounded distances or {@code null}
+                if they are to be computed one by one.
+        """
+        if numpy is None or not 0 < len(word) <= 64:
+            return None
+        if isinstance(candidates, Levenshtein.Batch):
+            batch = candidates
+        elif len(candidates) < Levenshtein.BATCH_MIN_CANDIDATES:
+            return None
+        else:
+            batch = Levenshtein.Batch(candidates)
+        if len(batch) == 0:
+            return numpy.zeros(0, dtype=numpy.int64)
+
+        la = len(word)
+        # The word is the pattern: character -> bit mask of its positions
+        peq = {}
+        for i, c in enumerate(word):
+            peq[c] = peq.get(c, 0) | (1 << i)
+        # Alphabet index -> pattern mask; the padding (-1) gets the last, 0, mask.
+        char_masks = numpy.array([peq.get(c, 0) for c in batch.alphabet] + [0], dtype=numpy.uint64)
+        eqs = char_masks[batch.chars]
+        lengths = batch.lengths
+
+        mask = numpy.uint64((1 << la) - 1)
+        last = numpy.uint64(1 << (la - 1))
+        one = numpy.uint64(1)
+        zero = numpy.uint64(0)
+        pv = numpy.full(len(batch), mask, dtype=numpy.uint64)
+        mv = numpy.zeros(len(batch), dtype=numpy.uint64)
+        scores = numpy.full(len(batch), la, dtype=numpy.int64)
+
+        for j in range(eqs.shape[1]):
+            active = lengths > j
+            eq = eqs[:, j]
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            scores += numpy.where(active & ((ph & last) != zero), 1, 0)
+            scores -= numpy.where(active & ((ph & last) == zero) & ((mh & last) != zero), 1, 0)
+            ph = ((ph << one) | one) & mask
+            mh = (mh << one) & mask
+            pv = numpy.where(active, mh | (~(xv | ph) & mask), pv)
+            mv = numpy.where(active, ph & xv, mv)
+
+        if max_n >= 0:
+            scores = numpy.minimum(scores, max_n + 1)
+            # Only the close pairs, so that a big batch does not flush the cache.
+            for k in numpy.flatnonzero(scores <= max_n).tolist():
+                c = batch.words[k]
+                if c != word:
+                    key = (sys.intern(word), sys.intern(c)) if word < c else (sys.intern(c), sys.intern(word))
+                    self.__cache_put(key, (int(scores[k]), True))
+        return scores
+
+    @staticmethod
+    def __bounded_distance(a, b, max_n):
+        """
+        :return: (the distance, {@code true}) or (a lower bound of
+                the distance greater than {@code max_n}, {@code false}).
+        """
         la = len(a)
         lb = len(b)
 
         if 0 <= max_n < abs(la - lb):
-            self.__levenshtein_cache[keyab] = max_n + 1
-            self.__levenshtein_cache[keyba] = max_n + 1
-            return max_n + 1
+            return abs(la - lb), False
         if la == 0:
-            self.__levenshtein_cache[keyab] = lb
-            self.__levenshtein_cache[keyba] = lb
-            return lb
+            return lb, True
         if lb == 0:
-            self.__levenshtein_cache[keyab] = la
-            self.__levenshtein_cache[keyba] = la
-            return la
+            return la, True
         if la < lb:
-            tl = la
-            la = lb
-            lb = tl
-            ts = a
-            a = b
-            b = ts
-
-        cost = [0] * (lb + 1)
-        i = 1
-        while i <= la:
-            cost[0] = i
-            prv = i - 1
-            mindle = prv
-            j = 1
-            while j <= lb:
-                act = prv + (0 if a[i - 1] == b[j - 1] else 1)
-                prv = cost[j]
-                cost[j] = min(1 + prv, 1 + cost[j - 1], act)
-                if prv < mindle:
-                    mindle = prv
-                j += 1
-            if 0 <= max_n < mindle:
-                self.__levenshtein_cache[keyab] = max_n + 1
-                self.__levenshtein_cache[keyba] = max_n + 1
-                return max_n + 1
-            i += 1
+            # The longer string is the pattern, the shorter one is
+            # scanned, one character at a time.
+            a, b = b, a
+            la, lb = lb, la
 
-        if 0 <= max_n < cost[lb]:
-            self.__levenshtein_cache[keyab] = max_n + 1
-            self.__levenshtein_cache[keyba] = max_n + 1
-            return max_n + 1
+        # Character -> bit mask of its positions in the pattern
+        peq = {}
+        bit = 1
+        for c in a:
+            peq[c] = peq.get(c, 0) | bit
+            bit <<= 1
+        mask = (1 << la) - 1
+        last = 1 << (la - 1)
+        pv = mask
+        mv = 0
+        score = la
+
+        for j in range(lb):
+            eq = peq.get(b[j], 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            # The remaining characters can lower the score by at most 1 each.
+            if 0 <= max_n < score - (lb - j - 1):
+                return score - (lb - j - 1), False
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
 
-        self.__levenshtein_cache[keyab] = cost[lb]
-        self.__levenshtein_cache[keyba] = cost[lb]
-        return cost[lb]
\ No newline at end of file
+        return score, True
@@ -0,0 +1,203 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from ro.racai.robin.nlp.word_net import WordNet
+
+
+class OfflineWordNet(WordNet):
+    """
+    <p>A {@link WordNet} that answers from a local, memory-mapped
+    snapshot index, with no network calls. Several processes that
+    open the same index file share one copy of the data.</p>
+    <p>The index is a sorted lemma table and, for each relation
+    (synonyms, hypernyms, hyponyms), CSR-style adjacency arrays:
+    the neighbours of lemma {@code i} are the lemma ids
+    {@code indices[indptr[i]:indptr[i + 1]]}.</p>
+    <p>File layout, all integers are unsigned 32-bit little-endian:
+    header (magic, number of lemmas, number of entries in each relation),
+    lemma offsets, (indptr, indices) for each relation and the
+    UTF-8 lemma strings.</p>
+    """
+    MAGIC = b"RWN1"
+    HEADER = struct.Struct("<4sIIII")
+    # The order of the relations in the index.
+    RELATIONS = ("synonyms", "hypernyms", "hyponyms")
+
+    def __init__(self, index_file):
+        """
+        :param index_file: the index built with {@link #build_index(Iterable, String)}.
+        """
+        super().__init__(None, None, None)
+        self.__file = open(index_file, "rb")
+        self.__mm = None
+        # Views into the mapped file, released on close.
+        self.__views = []
+        try:
+            self.__mm = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.__lemma_count, *nnz = OfflineWordNet.HEADER.unpack_from(self.__mm, 0)
+            if magic != OfflineWordNet.MAGIC:
+                raise RuntimeError("Bad magic!")
+
+            position = OfflineWordNet.HEADER.size
+            self.__offsets, position = self.__u32_array(position, self.__lemma_count + 1)
+            # (indptr, indices) for each relation
+            self.__adjacency = []
+            for relation_nnz in nnz:
+                indptr, position = self.__u32_array(position, self.__lemma_count + 1)
+                indices, position = self.__u32_array(position, relation_nnz)
+                self.__adjacency.append((indptr, indices))
+            self.__strings_start = position
+            if self.__strings_start + self.__offsets[self.__lemma_count] > len(self.__mm):
+                raise RuntimeError("Truncated lemma strings!")
+        except (RuntimeError, struct.error, ValueError, TypeError) as err:
+            # A truncated, empty or foreign file
+            self.close()
+            raise RuntimeError("'" + index_file + "' is not a WordNet index file!") from err
+
+    def __u32_array(self, position, length):
+        end = position + 4 * length
+        if end > len(self.__mm):
+            raise RuntimeError("Truncated array!")
+        if sys.byteorder == "little":
+            view = memoryview(self.__mm)[position:end].cast("I")
+            self.__views.append(view)
+            return view, end
+        # Big-endian machines get a private, byte-swapped copy.
+        values = array("I")
+        values.frombytes(self.__mm[position:end])
+        values.byteswap()
+        return values, end
+
+    def close(self):
+        self.__offsets = None
+        self.__adjacency = []
+        for view in self.__views:
+            view.release()
+        self.__views = []
+        if self.__mm is not None:
+            self.__mm.close()
+        self.__file.close()
+
+    def __lemma_bytes(self, lemma_id):
+        return self.__mm[self.__strings_start + self.__offsets[lemma_id]:
+                         self.__strings_start + self.__offsets[lemma_id + 1]]
+
+    def lemma_id(self, word):
+        """
+        <p>Binary search for a word in the lemma table.</p>
+        :param word: the word to look for;
+        :return: the id of the lemma or -1 if the word is not in the index.
+        """
+        key = word.encode("UTF-8")
+        low = 0
+        high = self.__lemma_count - 1
+        while low <= high:
+            middle = (low + high) // 2
+            lemma = self.__lemma_bytes(middle)
+            if lemma < key:
+                low = middle + 1
+            elif lemma > key:
+                high = middle - 1
+            else:
+                return middle
+        return -1
+
+    def __relation_members(self, lemma_id, relation):
+        indptr, indices = self.__adjacency[relation]
+        members = []
+        for neighbour in indices[indptr[lemma_id]:indptr[lemma_id + 1]]:
+            members.append(self.__lemma_bytes(neighbour).decode("UTF-8"))
+        return members
+
+    def fetch_record(self, word):
+        lemma_id = self.lemma_id(word)
+        if lemma_id < 0:
+            return self.Record(word)
+        return self.Record(word, None,
+                           self.__relation_members(lemma_id, 0),
+                           self.__relation_members(lemma_id, 1),
+                           self.__relation_members(lemma_id, 2))
+
+    def get_hypernyms(self, word):
+        return self.get_record(word).hypernyms
+
+    def get_hyponyms(self, word):
+        return self.get_record(word).hyponyms
+
+    def get_synonyms(self, word):
+        return self.get_record(word).synonyms
+
+    @staticmethod
+    def build_index(records, index_file):
+        """
+        <p>Builds the index file from WordNet records, e.g. the ones
+        accumulated by {@link WordNet#dump_word_net_cache()} or an
+        exported RoWN dump converted to {@link WordNet.Record}s.</p>
+        :param records: an iterable of {@link WordNet.Record} objects;
+        :param index_file: the index file to write.
+        :return:
+        """
+        records = list(records)
+        lemmas = set()
+        for record in records:
+            lemmas.add(record.word)
+            for relation in OfflineWordNet.RELATIONS:
+                lemmas.update(getattr(record, relation))
+        # Sorted by UTF-8 bytes, as the binary search compares them.
+        encoded = sorted([lemma.encode("UTF-8") for lemma in lemmas])
+        ids = {}
+        for i, lemma in enumerate(encoded):
+            ids[lemma.decode("UTF-8")] = i
+
+        offsets = array("I", [0])
+        for lemma in encoded:
+            offsets.append(offsets[-1] + len(lemma))
+
+        by_id = {}
+        for record in records:
+            by_id[ids[record.word]] = record
+        adjacency = []
+        for relation in OfflineWordNet.RELATIONS:
+            indptr = array("I", [0])
+            indices = array("I")
+            for i in range(len(encoded)):
+                if i in by_id:
+                    # Keep the first occurrence of each neighbour only.
+                    for member in dict.fromkeys(getattr(by_id[i], relation)):
+                        indices.append(ids[member])
+                indptr.append(len(indices))
+            adjacency.append((indptr, indices))
+
+        def u32_bytes(values):
+            if sys.byteorder != "little":
+                values = array("I", values)
+                values.byteswap()
+            return values.tobytes()
+
+        with open(index_file, "wb") as wrt:
+            wrt.write(OfflineWordNet.HEADER.pack(OfflineWordNet.MAGIC, len(encoded),
+                                                 *[len(indices) for indptr, indices in adjacency]))
+            wrt.write(u32_bytes(offsets))
+            for indptr, indices in adjacency:
+                wrt.write(u32_bytes(indptr))
+                wrt.write(u32_bytes(indices))
+            for lemma in encoded:
+                wrt.write(lemma)
+
+    @staticmethod
+    def build_index_from_file(records_file, index_file):
+        """
+        <p>Builds the index file from a WordNet records text file.</p>
+        :param records_file: the file with one {@link WordNet.Record#text_record()} per line;
+        :param index_file: the index file to write.
+        :return:
+        """
+        records = []
+        with open(records_file, encoding="UTF-8") as rdr:
+            for line in rdr:
+                line = line.rstrip("\n")
+                if line:
+                    records.append(WordNet.Record.from_text_record(line))
+        OfflineWordNet.build_index(records, index_file)
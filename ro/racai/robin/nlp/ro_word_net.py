@@ -1,4 +1,3 @@
-import json
 import logging
 from urllib import parse
 
@@ -18,39 +17,54 @@ class RoWordNet(WordNet):
         super().__init__()
 
     def get_hypernyms(self, word):
-        return RoWordNet.get_relation_members(word, "hypernym")
+        return self.get_record(word).hypernyms
 
     def get_hyponyms(self, word):
-        return RoWordNet.get_relation_members(word, "hyponym")
-
-    @staticmethod
-    def get_relation_members(word, real_name):
-        members = []
-        root = RoWordNet.json_word_net_response(word)
-        if not bool(root):
-            return members
-        senses = root["senses"]
-        for sense in senses:
-            relations = sense["relations"]
-            for relation in relations:
-                relation_name = relation["rel"]
-                if relation_name == real_name:
-                    members.append(str(relation["tliteral"]))
-        return members
+        return self.get_record(word).hyponyms
 
     def get_synonyms(self, word):
-        synonyms = []
-        root = RoWordNet.json_word_net_response(word)
+        return self.get_record(word).synonyms
+
+    def fetch_record(self, word):
+        try:
+            root = RoWordNet.json_word_net_response(word)
+        except requests.RequestException as exc:
+            logging.error("RELATE query failed for word '" + word + "'")
+            logging.exception(exc)
+            return None
+        if root is None:
+            # The lookup failed, it is not an unknown word.
+            return None
+        return RoWordNet.record_from_json(word, root)
+
+    @staticmethod
+    def record_from_json(word, root):
+        """
+        <p>Parses all the relations of a word from the RELATE response.</p>
+        :param word: the word that was looked up;
+        :param root: the JSON response of the RELATE platform;
+        :return: the {@link WordNet.Record} of the word.
+        """
         if not bool(root):
             # If word is not found in WordNet...
-            return synonyms
-        senses = root["senses"]
-        for sense in senses:
-            synset = str(sense["literal"]).split(",")
-            for syn in synset:
+            return WordNet.Record(word)
+        senses = []
+        synonyms = []
+        hypernyms = []
+        hyponyms = []
+        for sense in root["senses"]:
+            literal = str(sense["literal"])
+            senses.append(literal)
+            for syn in literal.split(","):
                 if syn != word:
                     synonyms.append(syn)
-        return synonyms
+            for relation in sense["relations"]:
+                relation_name = relation["rel"]
+                if relation_name == "hypernym":
+                    hypernyms.append(str(relation["tliteral"]))
+                elif relation_name == "hyponym":
+                    hyponyms.append(str(relation["tliteral"]))
+        return WordNet.Record(word, senses, synonyms, hypernyms, hyponyms)
 
     @staticmethod
     def json_word_net_response(word):
@@ -62,11 +76,10 @@ class RoWordNet(WordNet):
         headers = {'Content-Type': 'application/json'}
         response = requests.get(url=query, headers=headers)
         status_code = response.status_code
-     
 
         if status_code == 200:
-            return json.loads(json.dumps(response.json()))
+            return response.json()
         else:
-            logging.error("RELATE query error for word '" + word + "'; error code " + status_code)
+            logging.error("RELATE query error for word '" + word + "'; error code " + str(status_code))
 
-        return None
\ No newline at end of file
+        return None
@@ -1,8 +1,26 @@
+import re
+
 
 class StringUtils:
     """
     <p>Class dealing with string-related useful functions.</p>
     """
+    # A word is a run of letters/digits, possibly joined by
+    # in-word punctuation, e.g. <i>Workshop-ul</i> or <i>8:00</i>.
+    WORD_PATT = re.compile(r"[^\W_]+(?:[-:.'][^\W_]+)*")
+
     @staticmethod
     def is_none_empty_or_blank(input):
         return input in (None, "") or not input.strip()
+
+    @staticmethod
+    def split_words(text):
+        """
+        <p>Splits a raw (not annotated) text into words,
+        dropping punctuation and spaces.</p>
+        :param text: the text to be split;
+        :return: the list of words in {@code text}.
+        """
+        if text is None:
+            return []
+        return StringUtils.WORD_PATT.findall(text)
@@ -86,6 +86,9 @@ class TextProcessor(metaclass=ABCMeta):
             """
             self.arg_tokens = toks
             self.is_query_variable = isvar
+            # Bound concepts that are mentioned exactly in this argument.
+            # If {@code null}, they were not looked up yet.
+            self.exact_concepts = None
 
     class Query:
         """
@@ -93,7 +96,7 @@ class TextProcessor(metaclass=ABCMeta):
          from the user's request in written Romanian.</p>
         """
 
-        def __init__(self, query_type=None, action_verb=None, predicate_arguments=[]):
+        def __init__(self, query_type=None, action_verb=None, predicate_arguments=None):
             """
             :param query_type: What the query asks for,e.g. a person, a location, etc.
             :param action_verb: What is the main verb (lemma) of the query/question.
@@ -106,7 +109,7 @@ class TextProcessor(metaclass=ABCMeta):
             """
             self.query_type = query_type
             self.action_verb = action_verb
-            self.predicate_arguments = predicate_arguments
+            self.predicate_arguments = predicate_arguments if predicate_arguments is not None else []
 
     def text_processor(self, text):
         """
@@ -115,8 +118,7 @@ class TextProcessor(metaclass=ABCMeta):
         :param text: the text to be analyzed
         :return: the list of tokens to work with
         """
-        text = self._normalize_text(text)
-        text = self.text_correction(text)
+        text = self.normalize_text(text)
         if text in self._processed_text_cache:
             return self._processed_text_cache[text]
 
@@ -124,6 +126,33 @@ class TextProcessor(metaclass=ABCMeta):
         self._processed_text_cache[text] = proc_text
         return proc_text
 
+    def cached_text_processor(self, text):
+        """
+        <p>Same as {@link #text_processor(String)} but it never calls
+        {@link #process_text(String)}: only the processed text cache is used.
+        Useful for speculative work on partial ASR results.</p>
+        :param text: the text to be looked up
+        :return: the list of tokens or {@code null} if text was not processed before
+        """
+        text = self.normalize_text(text)
+        return self._processed_text_cache.get(text)
+
+    def get_cached_tokens(self):
+        """
+        <p>Get all the annotated texts from the processed text cache.</p>
+        :return: an iterable over lists of {@link Token}s.
+        """
+        return self._processed_text_cache.values()
+
+    def normalize_text(self, text):
+        """
+        <p>Normalization and correction steps that are done
+        before the text is looked up or processed.</p>
+        :param text: the raw text
+        :return: the text used as key in the processed text cache
+        """
+        return self.text_correction(self._normalize_text(text))
+
     def no_functional_words_length(self, sentence):
         """
         <p>Returns the length of a sentence disregarding functional words.</p>
@@ -1,6 +1,14 @@
+import asyncio
 import logging
 import os
+import struct
+import time
+import weakref
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from ro.racai.robin.nlp.bloom_filter import BloomFilter
+from ro.racai.robin.nlp.word_pair_cache import WordPairCache
 
 
 class WordNet(metaclass=ABCMeta):
@@ -9,47 +17,315 @@ class WordNet(metaclass=ABCMeta):
     Currently used to retrieve words that form different
     semantic relations.</p>
     """
+    # Seconds to remember that a word is not in WordNet.
+    UNKNOWN_WORD_TTL = 7 * 24 * 3600
+    # Seconds to wait before a failed lookup is retried.
+    FAILED_LOOKUP_TTL = 300
+    # Maximum number of concurrent asyncio lookups.
+    ASYNC_MAX_CONCURRENCY = 8
+    # The file of the false word pairs, next to the records file.
+    FALSE_PAIRS_FILE_NAME = "wordnet-false-pairs.bin"
+    # The expected number of false word pairs: the user's words times the
+    # words of a micro-world, over many sessions. A filter with this many
+    # pairs, or older than FALSE_PAIRS_TTL seconds, is replaced by an empty one.
+    FALSE_PAIRS_CAPACITY = 1000000
+    FALSE_PAIRS_ERROR_RATE = 0.001
+    FALSE_PAIRS_TTL = UNKNOWN_WORD_TTL
 
-    def __init__(self, wn_equals_cache={},
+    def __init__(self, wn_equals_cache=None,
                  wn_equals_cache_file=os.path.abspath(os.path.split(
-                     os.path.abspath(os.path.realpath(__file__)))[0] + "/../../../../wordnet-cache.txt")):
+                     os.path.abspath(os.path.realpath(__file__)))[0] + "/../../../../wordnet-cache.bin"),
+                 wn_records_file=os.path.abspath(os.path.split(
+                     os.path.abspath(os.path.realpath(__file__)))[0] + "/../../../../wordnet-records.txt")):
         """
-        :param wn_equals_cache: The equals cache map, to avoid
+        :param wn_equals_cache: The equals cache, a {@link WordPairCache}, to avoid
                                 expensive calls to the RELATE platform.
-        :param wn_equals_cache_file: Where to save the WordNet equals cache.
+        :param wn_equals_cache_file: Where to save the WordNet equals cache;
+                                if {@code null}, it is not saved.
+        :param wn_records_file: Where to save the WordNet records of the
+                                looked up words; if {@code null}, they are not saved.
+                                The false word pairs are saved in the same folder.
         """
-        self._wn_equals_cache = wn_equals_cache
+        self._wn_equals_cache = wn_equals_cache if wn_equals_cache is not None else WordPairCache()
         self._wn_equals_cache_file = wn_equals_cache_file
+        # Word -> {@link Record}, one WordNet lookup per word.
+        self._wn_records = {}
+        self._wn_records_file = wn_records_file
+        # Word -> (expiry time, failed lookup) for words that are
+        # not in WordNet or whose lookup failed.
+        self._wn_negative_cache = {}
+        # Keys of the word pairs that are not equal; most pairs end up here.
+        self._wn_false_pairs = self.new_false_pairs()
+        self._wn_false_pairs_file = None if wn_records_file is None else \
+            os.path.join(os.path.dirname(wn_records_file), WordNet.FALSE_PAIRS_FILE_NAME)
+        # Event loop -> (semaphore, word -> pending lookup) for the asyncio API.
+        self._wn_async_state = weakref.WeakKeyDictionary()
+        # (w1, w2) -> (hops, searched hops) memo of {@link #word_net_distance}.
+        self._wn_distance_cache = {}
         self.populate_word_net_equals_cache()
+        self.populate_word_net_records()
+        self.populate_word_net_false_pairs()
+
+    class Record:
+        """
+        <p>Everything that WordNet knows about a word,
+        obtained with a single lookup.</p>
+        """
+
+        def __init__(self, word, senses=None, synonyms=None, hypernyms=None, hyponyms=None):
+            """
+            :param word: the looked up word;
+            :param senses: the literals of the synsets the word belongs to;
+            :param synonyms: the synonyms of the word, regardless of the meaning;
+            :param hypernyms: the direct hypernyms of the word, regardless of the meaning;
+            :param hyponyms: the direct hyponyms of the word, regardless of the meaning.
+            """
+            self.word = word
+            self.senses = senses if senses is not None else []
+            self.synonyms = synonyms if synonyms is not None else []
+            self.hypernyms = hypernyms if hypernyms is not None else []
+            self.hyponyms = hyponyms if hyponyms is not None else []
+            # First order neighbourhood, for membership tests.
+            self.neighbours = set(self.synonyms)
+            self.neighbours.update(self.hypernyms)
+            self.neighbours.update(self.hyponyms)
+
+        def is_empty(self):
+            return not self.senses and not self.neighbours
+
+        # Separates the members of a relation in a text record.
+        MEMBER_SEPARATOR = "|"
+
+        def text_record(self):
+            sep = WordNet.Record.MEMBER_SEPARATOR
+            return self.word + "\t" + sep.join(self.senses) + "\t" + \
+                sep.join(self.synonyms) + "\t" + sep.join(self.hypernyms) + \
+                "\t" + sep.join(self.hyponyms)
+
+        @staticmethod
+        def from_text_record(line):
+            """
+            <p>The inverse of {@link #text_record()}.</p>
+            :param line: the text record, without the end of line;
+            :return: the {@link Record} object.
+            """
+            parts = line.split("\t")
+            members = []
+            for part in parts[1:5]:
+                members.append(part.split(WordNet.Record.MEMBER_SEPARATOR) if part else [])
+            return WordNet.Record(parts[0], members[0], members[1], members[2], members[3])
 
     def populate_word_net_equals_cache(self):
-        if not os.path.exists(self._wn_equals_cache_file):
+        if self._wn_equals_cache_file is None or not os.path.exists(self._wn_equals_cache_file):
             # On first run this file does not exist yet.
             return
-        rdr = open(self._wn_equals_cache_file, encoding="UTF-8")
         try:
-            while True:
-                line = rdr.readline()
-                if line == '':
-                    break
-                parts = line.split()
-                self._wn_equals_cache[parts[0]] = True if parts[1] == "true" else False
-        except IOError as ioe:
+            stored = WordPairCache()
+            stored.load(self._wn_equals_cache_file)
+            for (w1, w2), answer in stored.items():
+                self._wn_equals_cache.put(w1, w2, answer)
+        except (IOError, RuntimeError, struct.error, ValueError, IndexError) as err:
+            # A truncated or corrupt file: start with an empty cache.
             logging.warning("Could not open or read " + self._wn_equals_cache_file)
+            logging.exception(err)
+
+    def populate_word_net_false_pairs(self):
+        if self._wn_false_pairs_file is None or not os.path.exists(self._wn_false_pairs_file):
+            # On first run this file does not exist yet.
+            return
+        try:
+            stored = BloomFilter()
+            stored.load(self._wn_false_pairs_file)
+            if not self.is_stale(stored):
+                self._wn_false_pairs = stored
+        except (IOError, RuntimeError, struct.error) as err:
+            # A truncated or corrupt file: start with an empty filter.
+            logging.warning("Could not open or read " + self._wn_false_pairs_file)
+            logging.exception(err)
+
+    def new_false_pairs(self):
+        """
+        :return: an empty {@link BloomFilter} for the false word pairs.
+        """
+        return BloomFilter(self.FALSE_PAIRS_CAPACITY, self.FALSE_PAIRS_ERROR_RATE)
+
+    def is_stale(self, false_pairs):
+        """
+        <p>A filter of false word pairs is stale when it is full, so its
+        error rate is too high, or older than {@link #FALSE_PAIRS_TTL},
+        so WordNet may have changed.</p>
+        :param false_pairs: the {@link BloomFilter} to check;
+        :return: {@code true} if the filter should be replaced.
+        """
+        return false_pairs.is_full() or false_pairs.get_created() + self.FALSE_PAIRS_TTL <= time.time()
+
+    def populate_word_net_records(self):
+        if self._wn_records_file is None or not os.path.exists(self._wn_records_file):
+            # On first run this file does not exist yet.
+            return
+        try:
+            with open(self._wn_records_file, encoding="UTF-8") as rdr:
+                for line in rdr:
+                    line = line.rstrip("\n")
+                    if not line:
+                        continue
+                    record = self.Record.from_text_record(line)
+                    parts = line.split("\t")
+                    if len(parts) > 5:
+                        # Unknown word, with the expiry time of this information.
+                        if float(parts[5]) > time.time():
+                            self._wn_negative_cache[record.word] = (float(parts[5]), False)
+                    else:
+                        self.__store_record(record)
+        except IOError as ioe:
+            logging.warning("Could not open or read " + self._wn_records_file)
             logging.exception(ioe)
-        finally:
-            rdr.close()
 
     def dump_word_net_cache(self):
+        if self._wn_equals_cache_file is not None:
+            try:
+                self._wn_equals_cache.save(self._wn_equals_cache_file)
+            except IOError as ioe:
+                logging.warning("Could not open or write to " + self._wn_equals_cache_file)
+                logging.exception(ioe)
+        if self._wn_false_pairs_file is not None:
+            try:
+                self._wn_false_pairs.save(self._wn_false_pairs_file)
+            except IOError as ioe:
+                logging.warning("Could not open or write to " + self._wn_false_pairs_file)
+                logging.exception(ioe)
+        if self._wn_records_file is None:
+            return
         try:
-            wrt = open(self._wn_equals_cache_file, 'w', encoding="UTF-8")
-            for eqk in self._wn_equals_cache:
-                wrt.write(eqk + "\t" + self._wn_equals_cache[eqk] + "\n")
+            with open(self._wn_records_file, 'w', encoding="UTF-8") as wrt:
+                for record in self._wn_records.values():
+                    wrt.write(record.text_record() + "\n")
+                for word, (expiry, failed) in self._wn_negative_cache.items():
+                    if not failed:
+                        wrt.write(self.Record(word).text_record() + "\t" + str(expiry) + "\n")
         except IOError as ioe:
-            logging.warning("Could not open or write to " + self._wn_equals_cache_file)
+            logging.warning("Could not open or write to " + self._wn_records_file)
             logging.exception(ioe)
+
+    def get_record(self, word):
+        """
+        <p>Get the WordNet {@link Record} of a word. The word
+        is looked up only once, then the record is cached.</p>
+        :param word: the word to get the record for;
+        :return: the {@link Record} of the word.
+        """
+        if word in self._wn_records:
+            return self._wn_records[word]
+        if self.is_negative_cached(word):
+            return self.Record(word)
+        return self.__store_record(self.fetch_record(word), word)
+
+    def is_negative_cached(self, word):
+        """
+        <p>Checks if a word is known to be missing from WordNet
+        or if its last lookup failed, and this is not expired yet.</p>
+        :param word: the word to check;
+        :return: {@code true} if the word should not be looked up now.
+        """
+        if word not in self._wn_negative_cache:
+            return False
+        if self._wn_negative_cache[word][0] > time.time():
+            return True
+        del self._wn_negative_cache[word]
+        return False
+
+    def __store_record(self, record, word=None):
+        """
+        <p>Caches a looked up record. Empty records and failed lookups
+        ({@code null} records) go to the negative cache, with their expiry.</p>
+        :param record: the looked up record or {@code null} if the lookup failed;
+        :param word: the looked up word;
+        :return: the record to use for the word.
+        """
+        if record is None:
+            self._wn_negative_cache[word] = (time.time() + self.FAILED_LOOKUP_TTL, True)
+            return self.Record(word)
+        if record.is_empty():
+            self._wn_negative_cache[record.word] = (time.time() + self.UNKNOWN_WORD_TTL, False)
+            return record
+        self._wn_records[record.word] = record
+        return record
+
+    def prefetch(self, words, max_workers=8):
+        """
+        <p>Looks up, in parallel, the words that do not have
+        a {@link Record} yet, so that a batch of serial lookups
+        becomes one parallel wave.</p>
+        :param words: the words to look up;
+        :param max_workers: the maximum number of concurrent lookups.
+        :return:
+        """
+        missing = [w for w in dict.fromkeys(words)
+                   if w and w not in self._wn_records and not self.is_negative_cached(w)]
+        if not missing:
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            futures = [(word, executor.submit(self.fetch_record, word)) for word in missing]
+            for word, future in futures:
+                try:
+                    self.__store_record(future.result(), word)
+                except Exception as exc:
+                    # The word will be looked up again when needed.
+                    logging.warning("Could not prefetch the WordNet record of '" + word + "'")
+                    logging.exception(exc)
+
+    async def aget_record(self, word):
+        """
+        <p>The asyncio version of {@link #get_record(String)}. The lookup runs
+        in a worker thread, at most {@link #ASYNC_MAX_CONCURRENCY} at a time,
+        and concurrent requests for the same word share one lookup.
+        The caches are the same as for the blocking methods.</p>
+        :param word: the word to get the record for;
+        :return: the {@link Record} of the word.
+        """
+        if word in self._wn_records:
+            return self._wn_records[word]
+        if self.is_negative_cached(word):
+            return self.Record(word)
+        loop = asyncio.get_running_loop()
+        if loop not in self._wn_async_state:
+            self._wn_async_state[loop] = (asyncio.Semaphore(self.ASYNC_MAX_CONCURRENCY), {})
+        semaphore, pending = self._wn_async_state[loop]
+        if word not in pending:
+            pending[word] = loop.create_task(self.__async_fetch(semaphore, pending, word))
+        return await pending[word]
+
+    async def __async_fetch(self, semaphore, pending, word):
+        try:
+            async with semaphore:
+                record = await asyncio.get_running_loop().run_in_executor(None, self.fetch_record, word)
+            return self.__store_record(record, word)
         finally:
-            wrt.close()
+            del pending[word]
+
+    async def aword_net_equals_many(self, pairs):
+        """
+        <p>Resolves many {@link #word_net_equals(String, String)} checks together:
+        all the needed WordNet lookups are done concurrently.</p>
+        :param pairs: a list of (w1, w2) word pairs;
+        :return: the list of {@code true}/{@code false} answers, in the order of {@code pairs}.
+        """
+        words = {}
+        for w1, w2 in pairs:
+            if w1 not in self._wn_records:
+                words[w1] = True
+        await asyncio.gather(*[self.aget_record(w) for w in words])
+        return [self.word_net_equals(w1, w2) for w1, w2 in pairs]
+
+    def fetch_record(self, word):
+        """
+        <p>Looks up a word in WordNet. Override this to get all the relations
+        of the word with a single call to the WordNet resource.</p>
+        :param word: the word to look up;
+        :return: the {@link Record} of the word, empty if the word is not
+                in WordNet, or {@code null} if the lookup failed.
+        """
+        return self.Record(word, None, self.get_synonyms(word), self.get_hypernyms(word), self.get_hyponyms(word))
 
     @abstractmethod
     def get_hypernyms(self, word):
@@ -90,35 +366,105 @@ class WordNet(metaclass=ABCMeta):
         :return: {@code true} if {@code w1} and {@code w2}
                 are synonyms, first order hyponyms/hypernyms
         """
-        key12 = w1 + "#" + w2
-        key21 = w2 + "#" + w1
-
-        if key12 in self._wn_equals_cache:
-            return self._wn_equals_cache[key12]
-        if key21 in self._wn_equals_cache:
-            return self._wn_equals_cache[key21]
-
-        # Synonym check with WordNet
-        for syn in self.get_synonyms(w1):
-            if w2 == syn:
-                self._wn_equals_cache[key12] = True
-                self._wn_equals_cache[key21] = True
-                return True
-
-        # Use hypernyms from WordNet (only direct hypernyms)
-        for hyper in self.get_hypernyms(w1):
-            if w2 == hyper:
-                self._wn_equals_cache[key12] = True
-                self._wn_equals_cache[key21] = True
-                return True
-
-        # Use hyponyms from WordNet (only direct hyponyms)
-        for hypo in self.get_hyponyms(w1):
-            if w2 == hypo:
-                self._wn_equals_cache[key12] = True
-                self._wn_equals_cache[key21] = True
-                return True
-
-        self._wn_equals_cache[key12] = False
-        self._wn_equals_cache[key21] = False
-        return False
\ No newline at end of file
+        pair_key = self._wn_equals_cache.lookup_key(w1, w2)
+        if pair_key >= 0:
+            # Both words were seen before, the answer may be known.
+            answer = self._wn_equals_cache.get_by_key(pair_key)
+            if answer is not None:
+                return answer
+        # The word ids are not kept across runs, the words are.
+        false_pair_key = w1 + "\t" + w2 if w1 <= w2 else w2 + "\t" + w1
+        if self.is_stale(self._wn_false_pairs):
+            self._wn_false_pairs = self.new_false_pairs()
+        if false_pair_key in self._wn_false_pairs:
+            return False
+
+        # The relations are symmetrical (hypernym/hyponym), so
+        # the neighbourhood of an already looked up w2 can save a lookup.
+        if w1 not in self._wn_records and w2 in self._wn_records \
+                and w1 in self._wn_records[w2].neighbours:
+            self._wn_equals_cache.put(w1, w2, True)
+            return True
+
+        # Synonyms, direct hypernyms and direct hyponyms from WordNet
+        if w2 in self.get_record(w1).neighbours:
+            self._wn_equals_cache.put(w1, w2, True)
+            return True
+
+        if w1 in self._wn_negative_cache or w2 in self._wn_negative_cache:
+            # Do not remember the answer for a word that is not in WordNet,
+            # or whose lookup failed: it expires with the word.
+            return False
+        self._wn_false_pairs.add(false_pair_key)
+        return False
+
+    def word_net_distance(self, w1, w2, max_hops=2, max_nodes=100):
+        """
+        <p>Bidirectional breadth-first search in the WordNet graph
+        made of synonymy, hypernymy and hyponymy links to find
+        the number of links between two words.</p>
+        :param w1: first word parameter;
+        :param w2: second word parameter;
+        :param max_hops: the maximum number of links to follow;
+        :param max_nodes: the maximum number of words to expand (look up);
+        :return: the number of links between {@code w1} and {@code w2} or -1
+                if they are not connected within {@code max_hops} links
+                or within {@code max_nodes} word expansions.
+        """
+        if w1 == w2:
+            return 0
+        key = (w1, w2) if w1 < w2 else (w2, w1)
+        if key in self._wn_distance_cache:
+            hops, searched_hops = self._wn_distance_cache[key]
+            if hops >= 0:
+                return hops if hops <= max_hops else -1
+            if searched_hops >= max_hops:
+                return -1
+
+        hops, exhausted = self.__bidirectional_search(w1, w2, max_hops, max_nodes)
+        if not exhausted:
+            # Results cut by the node budget are not memoized,
+            # a bigger budget may find a path.
+            self._wn_distance_cache[key] = (hops, max_hops)
+        return hops
+
+    def __bidirectional_search(self, w1, w2, max_hops, max_nodes):
+        # Word -> hops from w1, respectively w2
+        dist1 = {w1: 0}
+        dist2 = {w2: 0}
+        frontier1 = [w1]
+        frontier2 = [w2]
+        depth1 = 0
+        depth2 = 0
+        expanded = 0
+
+        while frontier1 and frontier2 and depth1 + depth2 < max_hops:
+            # Expand the smaller frontier, one full layer at a time.
+            if len(frontier1) <= len(frontier2):
+                frontier, dist, other_dist, depth = frontier1, dist1, dist2, depth1
+            else:
+                frontier, dist, other_dist, depth = frontier2, dist2, dist1, depth2
+            best = -1
+            next_frontier = []
+            for word in frontier:
+                if expanded >= max_nodes:
+                    return best, True
+                expanded += 1
+                for neighbour in self.get_record(word).neighbours:
+                    if neighbour in other_dist:
+                        hops = depth + 1 + other_dist[neighbour]
+                        if best < 0 or hops < best:
+                            best = hops
+                    if neighbour not in dist:
+                        dist[neighbour] = depth + 1
+                        next_frontier.append(neighbour)
+            if best >= 0:
+                return best, False
+            if frontier is frontier1:
+                frontier1 = next_frontier
+                depth1 += 1
+            else:
+                frontier2 = next_frontier
+                depth2 += 1
+
+        return -1, False
@@ -0,0 +1,155 @@
+import struct
+import sys
+from array import array
+
+
+class WordPairCache:
+    """
+    <p>A cache of boolean answers for unordered word pairs, e.g.
+    the WordNet equality of two words. Words are interned to integer
+    ids and a pair is stored once, under a single 64-bit key
+    packing the two ids, smaller id first.</p>
+    <p>Binary file layout, all integers little-endian:
+    header (magic, number of words, number of pairs),
+    word offsets (unsigned 32-bit), pair keys (unsigned 64-bit),
+    pair answers (one byte each) and the UTF-8 word strings.</p>
+    """
+    MAGIC = b"WPC1"
+    HEADER = struct.Struct("<4sII")
+
+    def __init__(self):
+        # Word -> id and id -> word
+        self.__ids = {}
+        self.__words = []
+        # Packed pair key -> answer
+        self.__pairs = {}
+
+    def __len__(self):
+        return len(self.__pairs)
+
+    def intern(self, word):
+        """
+        :param word: the word to get the id of;
+        :return: the id of the word, a new one if the word was not seen before.
+        """
+        word_id = self.__ids.get(word)
+        if word_id is None:
+            word_id = len(self.__words)
+            self.__ids[word] = word_id
+            self.__words.append(word)
+        return word_id
+
+    def word_id(self, word):
+        """
+        :param word: the word to get the id of;
+        :return: the id of the word or -1 if the word was not interned.
+        """
+        return self.__ids.get(word, -1)
+
+    @staticmethod
+    def pair_key(id1, id2):
+        """
+        :return: the 64-bit key of the unordered pair of word ids.
+        """
+        if id1 > id2:
+            id1, id2 = id2, id1
+        return (id1 << 32) | id2
+
+    def key(self, w1, w2):
+        """
+        :return: the key of the unordered pair of words, interning the words.
+        """
+        return WordPairCache.pair_key(self.intern(w1), self.intern(w2))
+
+    def lookup_key(self, w1, w2):
+        """
+        :return: the key of the unordered pair of words or -1
+                if one of the words was not interned.
+        """
+        id1 = self.__ids.get(w1)
+        id2 = self.__ids.get(w2)
+        if id1 is None or id2 is None:
+            return -1
+        return WordPairCache.pair_key(id1, id2)
+
+    def get(self, w1, w2):
+        """
+        :return: the cached answer for the pair or {@code null} if there is none.
+        """
+        pkey = self.lookup_key(w1, w2)
+        if pkey < 0:
+            return None
+        return self.__pairs.get(pkey)
+
+    def get_by_key(self, pair_key):
+        """
+        :return: the cached answer for the pair key or {@code null} if there is none.
+        """
+        return self.__pairs.get(pair_key)
+
+    def put(self, w1, w2, answer):
+        self.__pairs[self.key(w1, w2)] = answer
+
+    def items(self):
+        """
+        :return: an iterator over the ((w1, w2), answer) entries of the cache.
+        """
+        for pkey, answer in self.__pairs.items():
+            yield (self.__words[pkey >> 32], self.__words[pkey & 0xFFFFFFFF]), answer
+
+    def save(self, cache_file):
+        """
+        <p>Writes the cache to a binary file.</p>
+        :param cache_file: the file to write.
+        :return:
+        """
+        encoded = [word.encode("UTF-8") for word in self.__words]
+        offsets = array("I", [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+        keys = array("Q", self.__pairs.keys())
+        answers = bytes([1 if answer else 0 for answer in self.__pairs.values()])
+        if sys.byteorder != "little":
+            offsets.byteswap()
+            keys.byteswap()
+
+        with open(cache_file, "wb") as wrt:
+            wrt.write(WordPairCache.HEADER.pack(WordPairCache.MAGIC, len(encoded), len(keys)))
+            wrt.write(offsets.tobytes())
+            wrt.write(keys.tobytes())
+            wrt.write(answers)
+            wrt.write(b"".join(encoded))
+
+    def load(self, cache_file):
+        """
+        <p>Adds the entries of a binary file written by
+        {@link #save(String)} to this cache.</p>
+        :param cache_file: the file to read.
+        :return:
+        """
+        with open(cache_file, "rb") as rdr:
+            data = rdr.read()
+        magic, word_count, pair_count = WordPairCache.HEADER.unpack_from(data, 0)
+        if magic != WordPairCache.MAGIC:
+            raise RuntimeError("'" + cache_file + "' is not a word pair cache file!")
+
+        position = WordPairCache.HEADER.size
+        offsets = array("I")
+        offsets.frombytes(data[position:position + 4 * (word_count + 1)])
+        position += 4 * (word_count + 1)
+        keys = array("Q")
+        keys.frombytes(data[position:position + 8 * pair_count])
+        position += 8 * pair_count
+        answers = data[position:position + pair_count]
+        position += pair_count
+        if sys.byteorder != "little":
+            offsets.byteswap()
+            keys.byteswap()
+
+        # The ids in the file -> the ids in this cache
+        file_ids = []
+        for i in range(word_count):
+            word = data[position + offsets[i]:position + offsets[i + 1]].decode("UTF-8")
+            file_ids.append(self.intern(word))
+        for pkey, answer in zip(keys, answers):
+            self.__pairs[WordPairCache.pair_key(file_ids[pkey >> 32], file_ids[pkey & 0xFFFFFFFF])] = answer == 1
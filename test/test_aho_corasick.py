@@ -0,0 +1,32 @@
+import unittest
+
+from ro.racai.robin.nlp.aho_corasick import AhoCorasick
+
+
+class TestAhoCorasick(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.matcher = AhoCorasick()
+        self.matcher.add_pattern("he", 1)
+        self.matcher.add_pattern("she", 2)
+        self.matcher.add_pattern("his", 3)
+        self.matcher.add_pattern("hers", 4)
+
+    def test_find_all(self):
+        self.assertListEqual(sorted(self.matcher.find_all("ushers")),
+                             [(1, 4, 2), (2, 4, 1), (2, 6, 4)])
+        self.assertListEqual(self.matcher.find_all("xyz"), [])
+
+    def test_find_longest(self):
+        self.assertListEqual(self.matcher.find_longest("ushers"), [(1, 4, 2)])
+
+    def test_word_patterns(self):
+        matcher = AhoCorasick()
+        matcher.add_pattern(("sala", "209"), "S1")
+        matcher.add_pattern(("sala",), "S")
+        self.assertListEqual(matcher.find_longest(["unde", "e", "sala", "209"]), [(2, 4, "S1")])
+        self.assertRaises(RuntimeError, matcher.add_pattern, (), "X")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import random
+import unittest
+
+from ro.racai.robin.nlp.bk_tree import BKTree
+from ro.racai.robin.nlp.levenshtein import Levenshtein
+
+
+class TestBKTree(unittest.TestCase):
+
+    def test_find(self):
+        lev = Levenshtein()
+        tree = BKTree(lev)
+        words = ["sala", "sală", "cursul", "cursurile", "laboratorul", "sisteme", "operare", "sala"]
+        for w in words:
+            tree.add(w)
+        self.assertEqual(len(tree), 7)
+        self.assertIn("sală", tree)
+        self.assertDictEqual(tree.find("sale", 1), {"sala": 1, "sală": 1})
+        self.assertDictEqual(tree.find("curs", 0), {})
+
+    def test_same_as_linear_scan(self):
+        rnd = random.Random(42)
+        lev = Levenshtein()
+        tree = BKTree(lev)
+        words = ["".join(rnd.choice("abcde") for _ in range(rnd.randint(1, 8))) for _ in range(300)]
+        for w in words:
+            tree.add(w)
+        for _ in range(50):
+            query = "".join(rnd.choice("abcde") for _ in range(rnd.randint(1, 8)))
+            expected = {}
+            for w in words:
+                d = lev.distance(query, w, -1)
+                if d <= 2:
+                    expected[w] = d
+            self.assertDictEqual(tree.find(query, 2), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
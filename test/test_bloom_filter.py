@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from ro.racai.robin.nlp.bloom_filter import BloomFilter
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_membership(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add("w" + str(i) + "#x")
+        for i in range(1000):
+            self.assertIn("w" + str(i) + "#x", bloom)
+        false_positives = len([i for i in range(10000) if ("v" + str(i) + "#y") in bloom])
+        self.assertLess(false_positives, 300)
+        self.assertEqual(len(bloom), 1000)
+
+    def test_integer_keys(self):
+        bloom = BloomFilter(100, 0.01)
+        bloom.add(1 << 40 | 7)
+        self.assertIn(1 << 40 | 7, bloom)
+        self.assertNotIn(7, bloom)
+
+    def test_save_load(self):
+        bloom = BloomFilter(100, 0.01)
+        bloom.add("sală\tcurs")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bloom_file = os.path.join(tmp_dir, "bloom.bin")
+            bloom.save(bloom_file)
+            loaded = BloomFilter()
+            loaded.load(bloom_file)
+        self.assertIn("sală\tcurs", loaded)
+        self.assertNotIn("curs\tsală", loaded)
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded.size_in_bytes(), bloom.size_in_bytes())
+        self.assertEqual(loaded.get_capacity(), 100)
+        self.assertEqual(loaded.get_created(), bloom.get_created())
+
+    def test_full(self):
+        bloom = BloomFilter(2, 0.01)
+        bloom.add("a")
+        self.assertFalse(bloom.is_full())
+        bloom.add("b")
+        self.assertTrue(bloom.is_full())
+
+    def test_bad_parameters(self):
+        self.assertRaises(RuntimeError, BloomFilter, 0)
+        self.assertRaises(RuntimeError, BloomFilter, 10, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+
+from ro.racai.robin.nlp.levenshtein import Levenshtein
+
+
+def dp_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (0 if a[i - 1] == b[j - 1] else 1))
+        previous = current
+    return previous[-1]
+
+
+class TestLevenshtein(unittest.TestCase):
+
+    def test_distance(self):
+        lev = Levenshtein()
+        self.assertEqual(lev.distance("kitten", "sitting", -1), 3)
+        self.assertEqual(lev.distance("sală", "sala", -1), 1)
+        self.assertEqual(lev.distance("", "curs", -1), 4)
+        self.assertEqual(lev.distance("curs", "curs", 0), 0)
+        self.assertTrue(lev.ld("cursul", "cursurile", 3))
+        self.assertFalse(lev.ld("cursul", "laboratorul", 3))
+
+    def test_random_strings(self):
+        rnd = random.Random(1234)
+        lev = Levenshtein()
+        for _ in range(500):
+            a = "".join(rnd.choice("abcă") for _ in range(rnd.randint(0, 12)))
+            b = "".join(rnd.choice("abcă") for _ in range(rnd.randint(0, 12)))
+            expected = dp_distance(a, b)
+            max_n = rnd.randint(-1, 6)
+            if 0 <= max_n < expected:
+                self.assertEqual(lev.distance(a, b, max_n), max_n + 1)
+            else:
+                self.assertEqual(lev.distance(a, b, max_n), expected)
+            # A cut off distance is not reused as an exact one.
+            self.assertEqual(lev.distance(b, a, -1), expected)
+
+    def test_distances(self):
+        rnd = random.Random(4321)
+        lev = Levenshtein()
+        for _ in range(20):
+            word = "".join(rnd.choice("abcă") for _ in range(rnd.randint(1, 10)))
+            candidates = ["".join(rnd.choice("abcă") for _ in range(rnd.randint(0, 12)))
+                          for _ in range(Levenshtein.BATCH_MIN_CANDIDATES * 2)]
+            max_n = rnd.randint(-1, 5)
+            self.assertListEqual(lev.distances(word, candidates, max_n),
+                                 [lev.distance(word, c, max_n) for c in candidates])
+
+    def test_neighbours(self):
+        lev = Levenshtein()
+        words = ["sala", "sală", "cursul", "curs", "laboratorul", ""] * Levenshtein.BATCH_MIN_CANDIDATES
+        expected = {"sala": 1, "sală": 0}
+        self.assertDictEqual(lev.neighbours("sală", words, 1), expected)
+        self.assertDictEqual(lev.neighbours("sală", Levenshtein.Batch(words), 1), expected)
+        self.assertDictEqual(lev.neighbours("sală", words[:6], 1), expected)
+        self.assertListEqual(lev.distances("curs", Levenshtein.Batch(words[:6]), 3), [4, 4, 2, 0, 4, 4])
+        # The close pairs were cached.
+        misses = lev.cache_stats()["misses"]
+        self.assertEqual(lev.distance("curs", "cursul", 3), 2)
+        self.assertEqual(lev.cache_stats()["misses"], misses)
+
+    def test_cache(self):
+        lev = Levenshtein(cache_size=2)
+        lev.distance("sala", "sală", -1)
+        lev.distance("sală", "sala", -1)
+        lev.distance("curs", "cursul", -1)
+        lev.distance("laborator", "laboratorul", -1)
+        stats = lev.cache_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["size"], 2)
+
+    def test_scratch_scope(self):
+        lev = Levenshtein()
+        with lev.scratch_scope():
+            lev.distance("sala", "sală", -1)
+            lev.distance("salla", "sală", -1)
+            with lev.scratch_scope():
+                lev.distance("sală", "sala", -1)
+            self.assertEqual(lev.cache_stats()["size"], 0)
+        # Only the pair that was needed again is kept.
+        self.assertEqual(lev.cache_stats()["size"], 1)
+        lev.distance("sala", "sală", -1)
+        self.assertEqual(lev.cache_stats()["hits"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
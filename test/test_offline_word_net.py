@@ -0,0 +1,68 @@
+import gc
+import os
+import tempfile
+import unittest
+import warnings
+
+from ro.racai.robin.nlp.offline_word_net import OfflineWordNet
+from ro.racai.robin.nlp.word_net import WordNet
+
+
+class TestOfflineWordNet(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index_file = os.path.join(self.tmp_dir.name, "rown.idx")
+        OfflineWordNet.build_index([
+            WordNet.Record("sală", None, ["cameră"], ["încăpere"], ["laborator", "aulă"]),
+            WordNet.Record("laborator", None, [], ["sală"], []),
+            WordNet.Record("curs", None, [], [], [])
+        ], self.index_file)
+        self.word_net = OfflineWordNet(self.index_file)
+
+    def tearDown(self) -> None:
+        self.word_net.close()
+        self.tmp_dir.cleanup()
+
+    def test_relations(self):
+        self.assertListEqual(self.word_net.get_synonyms("sală"), ["cameră"])
+        self.assertListEqual(self.word_net.get_hypernyms("sală"), ["încăpere"])
+        self.assertListEqual(self.word_net.get_hyponyms("sală"), ["laborator", "aulă"])
+        self.assertListEqual(self.word_net.get_synonyms("cameră"), [])
+        self.assertListEqual(self.word_net.get_synonyms("necunoscut"), [])
+
+    def test_word_net_equals(self):
+        self.assertTrue(self.word_net.word_net_equals("laborator", "sală"))
+        self.assertFalse(self.word_net.word_net_equals("curs", "sală"))
+
+    def test_lemma_id(self):
+        self.assertGreaterEqual(self.word_net.lemma_id("încăpere"), 0)
+        self.assertEqual(self.word_net.lemma_id("încăperi"), -1)
+
+    def test_build_index_from_file(self):
+        records_file = os.path.join(self.tmp_dir.name, "wordnet-records.txt")
+        with open(records_file, "w", encoding="UTF-8") as wrt:
+            wrt.write(WordNet.Record("ține", ["ține,desfășura"], ["desfășura"], [], []).text_record() + "\n")
+        index_file = os.path.join(self.tmp_dir.name, "other.idx")
+        OfflineWordNet.build_index_from_file(records_file, index_file)
+        word_net = OfflineWordNet(index_file)
+        self.assertTrue(word_net.word_net_equals("ține", "desfășura"))
+        word_net.close()
+
+    def test_bad_index(self):
+        with open(self.index_file, "rb") as rdr:
+            data = rdr.read()
+        bad_file = os.path.join(self.tmp_dir.name, "bad.idx")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            for bad in [b"", data[:10], data[:len(data) // 2], data[:len(data) - 1], b"XXXX" + data[4:]]:
+                with open(bad_file, "wb") as wrt:
+                    wrt.write(bad)
+                self.assertRaises(RuntimeError, OfflineWordNet, bad_file)
+            gc.collect()
+        # The file and its mapping were closed.
+        self.assertListEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,8 @@ from unittest import TestCase
 
 from ro.racai.robin.dialog.ctype import CType
 from ro.racai.robin.dialog.rd_concept import RDConcept
+from ro.racai.robin.nlp.ro_lexicon import RoLexicon
+from ro.racai.robin.nlp.text_processor import TextProcessor
 
 
 class TestRDConcept(TestCase):
@@ -31,6 +33,19 @@ class TestRDConcept(TestCase):
         new_concept5 = RDConcept(CType.PERSON, None, "ABC")
         self.assertEqual(new_concept5, canonical_form_none_concept)
 
+    def test_reference_features(self):
+        self.new_concept4.assigned_reference_tokens = [
+            TextProcessor.Token("Sala", "sală", "Ncfsry", 0, "root", False),
+            TextProcessor.Token("de", "de", "Spsa", 3, "case", False),
+            TextProcessor.Token("Consiliu", "consiliu", "Ncms-n", 1, "nmod", False)]
+        features = self.new_concept4.get_reference_features(RoLexicon())
+        self.assertListEqual(features.positions, [0, 2])
+        self.assertListEqual(features.lower_lemmas, ["sală", "consiliu"])
+        self.assertListEqual(features.lower_wforms, ["sala", "consiliu"])
+        self.assertEqual(features.length, 2)
+        self.assertEqual(features.size, 3)
+        self.assertIs(self.new_concept4.get_reference_features(RoLexicon()), features)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 
 from ro.racai.robin.dialog.ctype import CType
+from ro.racai.robin.dialog.rd_concept import RDConcept
 from ro.racai.robin.dialog.rd_constant import RDConstant
 
 
@@ -25,6 +26,14 @@ class TestRDConstant(unittest.TestCase):
         other2_rd_constants = RDConstant(CType.WORD, "REF")
         self.assertEqual(self.rd_constant1, other2_rd_constants)
 
+    def test_hash(self):
+        concept = RDConcept.builder(CType.WORD, "abc", [], "Ref")
+        self.assertEqual(self.rd_constant1, concept)
+        self.assertEqual(hash(self.rd_constant1), hash(concept))
+        self.assertEqual(hash(self.rd_constant1), hash(RDConstant(CType.WORD, "REF")))
+        self.assertNotEqual(hash(self.rd_constant1), hash(RDConstant(CType.WORD, "other")))
+        self.assertIn(concept, {self.rd_constant1})
+
 
 if __name__ == "__main__":
     unittest.main()
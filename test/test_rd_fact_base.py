@@ -0,0 +1,59 @@
+import unittest
+
+from ro.racai.robin.dialog.ctype import CType
+from ro.racai.robin.dialog.rd_concept import RDConcept
+from ro.racai.robin.dialog.rd_fact_base import RDFactBase
+from ro.racai.robin.dialog.rd_predicate import RDPredicate
+from ro.racai.robin.dialog.rd_universe import RDUniverse
+from ro.racai.robin.dialog.u_intent_type import UIntentType
+
+
+class TestRDFactBase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.hold = RDPredicate.builder(UIntentType.SAY_SOMETHING, "ține", ["desfășura"], None)
+        self.room = RDConcept.builder(CType.LOCATION, "sală", ["laborator"], "209")
+        self.course = RDConcept.builder(CType.WORD, "curs", ["materie"], "cursul de algebră")
+        self.lab = RDConcept.builder(CType.WORD, "curs", ["materie"], "laboratorul de PLN")
+        universe = RDUniverse(None, None, None)
+        for conc in [self.room, self.course, self.lab]:
+            universe.intern_concept(conc)
+        self.facts = RDFactBase()
+        self.facts.add_fact(self.hold, [self.course, self.room])
+        self.facts.add_fact(self.hold, [self.lab, self.room])
+
+    def test_interning(self):
+        self.assertEqual(len(self.facts), 2)
+        self.assertEqual(len(self.facts.get_definitions()), 1)
+        self.assertEqual(len(self.facts.get_concepts()), 3)
+        self.assertEqual(self.facts.get_definition_id(0), self.facts.get_definition_id(1))
+        self.assertEqual(list(self.facts.get_argument_ids(0)), [0, 1])
+        self.assertEqual(list(self.facts.get_argument_ids(1)), [2, 1])
+        self.assertEqual(list(self.facts.get_argument_indptr()), [0, 2, 4])
+        self.assertEqual(list(self.facts.get_argument_indices()), [0, 1, 2, 1])
+
+    def test_views(self):
+        pred = self.facts[1]
+        self.assertEqual(pred.get_action_verb(), "ține")
+        self.assertEqual(pred.get_user_intent(), UIntentType.SAY_SOMETHING)
+        self.assertIs(pred.get_arguments()[0], self.lab)
+        self.assertIs(pred.get_arguments()[1], self.room)
+        self.assertIs(self.facts[-1], pred)
+        self.assertIs(pred.get_synonyms(), self.facts[0].get_synonyms())
+        self.assertEqual([p.get_arguments()[0] for p in self.facts], [self.course, self.lab])
+        with self.assertRaises(IndexError):
+            self.facts[2]
+
+    def test_add_predicate(self):
+        pred = RDPredicate.builder(UIntentType.TAKE_ME_SOMEWHERE, "duce", [], [self.room])
+        self.facts.add_predicate(pred)
+        self.assertEqual(len(self.facts.get_definitions()), 2)
+        self.assertEqual(list(self.facts.get_argument_ids(2)), [1])
+        self.assertEqual(self.facts[2].get_action_verb(), "duce")
+        with self.assertRaises(RuntimeError):
+            self.facts.add_predicate(RDPredicate.builder(UIntentType.TAKE_ME_SOMEWHERE, "duce", [],
+                                                         [self.room.deep_copy()]))
+
+
+if __name__ == "__main__":
+    unittest.main()
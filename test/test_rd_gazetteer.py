@@ -0,0 +1,33 @@
+import unittest
+
+from ro.racai.robin.dialog.ctype import CType
+from ro.racai.robin.dialog.rd_concept import RDConcept
+from ro.racai.robin.dialog.rd_constant import RDConstant
+from ro.racai.robin.dialog.rd_gazetteer import RDGazetteer
+from ro.racai.robin.nlp.text_processor import TextProcessor
+
+
+class TestRDGazetteer(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.room = RDConcept(CType.LOCATION, "sala de consiliu", "sală")
+        self.person = RDConstant(CType.PERSON, "Adriana Vlad")
+        self.gazetteer = RDGazetteer()
+        self.gazetteer.add_concept(self.room)
+        self.gazetteer.add_concept(self.person)
+        self.gazetteer.add_concept(RDConcept(CType.WORD, None, "curs"))
+
+    def test_find_mentions(self):
+        words = ["Unde", "este", "Sala", "de", "consiliu"]
+        self.assertListEqual(self.gazetteer.find_mentions(words), [(2, 5, [self.room])])
+        self.assertListEqual(self.gazetteer.find_mentions(["sala", "de", "curs"]), [])
+
+    def test_mentioned_concepts(self):
+        tokens = [TextProcessor.Token("cu", "cu", "Spsa", 2, "case", False),
+                  TextProcessor.Token("Adriana", "Adriana", "Np", 0, "root", False),
+                  TextProcessor.Token("Vlad", "Vlad", "Np", 2, "flat", False)]
+        self.assertListEqual(self.gazetteer.mentioned_concepts(tokens), [self.person])
+
+
+if __name__ == "__main__":
+    unittest.main()
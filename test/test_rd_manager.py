@@ -0,0 +1,90 @@
+import os
+import unittest
+
+from ro.racai.robin.dialog.rd_manager import RDManager
+from ro.racai.robin.dialog.ro_sayings import RoSayings
+from ro.racai.robin.nlp.ro_lexicon import RoLexicon
+from ro.racai.robin.nlp.ro_text_processor import RoTextProcessor
+from ro.racai.robin.nlp.word_net import WordNet
+
+
+class CountingWordNet(WordNet):
+    RELATIONS = {
+        "ține": WordNet.Record("ține", ["ține,desfășura"], ["desfășura"], [], []),
+        "desfășura": WordNet.Record("desfășura", ["ține,desfășura"], ["ține"], [], [])
+    }
+
+    def __init__(self):
+        super().__init__(None, None, None)
+        # The looked up words, in order
+        self.fetched = []
+
+    def fetch_record(self, word):
+        self.fetched.append(word)
+        return CountingWordNet.RELATIONS.get(word, WordNet.Record(word))
+
+    def get_hypernyms(self, word):
+        return self.get_record(word).hypernyms
+
+    def get_hyponyms(self, word):
+        return self.get_record(word).hyponyms
+
+    def get_synonyms(self, word):
+        return self.get_record(word).synonyms
+
+
+class TestRDManager(unittest.TestCase):
+    MW_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "precis.mw")
+
+    def setUp(self) -> None:
+        # The questions are in the processed text cache or are template questions.
+        self.word_net = CountingWordNet()
+        self.manager = RDManager(self.word_net, RoLexicon(),
+                                 RoTextProcessor(RoLexicon(), self.word_net, RoSayings()), RoSayings())
+        self.manager.load_microworld(TestRDManager.MW_FILE)
+        self.analyzed = []
+        analyze_user_input = self.manager.analyze_user_input
+
+        def counting_analyze_user_input(user_input, cached_only=False):
+            self.analyzed.append(user_input)
+            return analyze_user_input(user_input, cached_only)
+
+        self.manager.analyze_user_input = counting_analyze_user_input
+
+    def test_warm_up(self):
+        self.manager.feed_partial_input("Unde se")
+        # The last word may still change.
+        self.assertNotIn("se", self.word_net.fetched)
+        self.manager.feed_partial_input("Unde se ține")
+        self.assertIn("se", self.word_net.fetched)
+        self.assertNotIn("ține", self.word_net.fetched[self.word_net.fetched.index("se"):])
+
+    def test_speculation_reused(self):
+        text = "Unde se ține cursul de sisteme de operare?"
+        self.manager.feed_partial_input("Unde se ține cursul")
+        self.manager.feed_partial_input(text)
+        self.analyzed.clear()
+        state = self.manager.do_conversation(text)
+        self.assertListEqual(self.analyzed, [])
+        self.assertListEqual(state.get_reply(), ["sala de consiliu"])
+
+    def test_speculation_not_reused(self):
+        self.manager.feed_partial_input("Unde se ține cursul de sisteme de operare?")
+        self.analyzed.clear()
+        state = self.manager.do_conversation("Unde se desfășoară laboratorul de informatică?")
+        self.assertListEqual(self.analyzed, ["Unde se desfășoară laboratorul de informatică?"])
+        self.assertListEqual(state.get_reply(), ["209"])
+
+    def test_template_follow_up(self):
+        self.manager.do_conversation("Unde se desfășoară laboratorul de informatică?")
+        self.analyzed.clear()
+        # A template question, which the laboratory predicate
+        # does not answer, in its context.
+        state = self.manager.do_conversation("Cine ține 209?")
+        self.assertListEqual(self.analyzed, ["Cine ține 209?"])
+        self.assertListEqual(state.get_reply(), RoSayings().robot_dont_know_lines())
+        self.assertFalse(state.is_dialogue_done())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from ro.racai.robin.dialog.ctype import CType
+from ro.racai.robin.dialog.rd_concept import RDConcept
+from ro.racai.robin.dialog.rd_name_index import RDNameIndex
+from ro.racai.robin.nlp.word_net import WordNet
+
+
+class ChainWordNet(WordNet):
+    RELATIONS = {
+        "sală": WordNet.Record("sală", [], [], ["încăpere"], ["amfiteatru"]),
+        "încăpere": WordNet.Record("încăpere", [], [], ["spațiu"], ["sală"]),
+        # Not a hyponym in the record of "sală"
+        "aulă": WordNet.Record("aulă", [], [], ["sală"], [])
+    }
+
+    def __init__(self):
+        super().__init__(None, None, None)
+        # The looked up words, in order
+        self.fetched = []
+
+    def fetch_record(self, word):
+        self.fetched.append(word)
+        return ChainWordNet.RELATIONS.get(word, WordNet.Record(word))
+
+    def get_hypernyms(self, word):
+        return self.get_record(word).hypernyms
+
+    def get_hyponyms(self, word):
+        return self.get_record(word).hyponyms
+
+    def get_synonyms(self, word):
+        return self.get_record(word).synonyms
+
+
+class TestRDNameIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.room = RDConcept.builder(CType.LOCATION, "sală", ["laborator", "cameră"], "209")
+        self.course = RDConcept.builder(CType.WORD, "curs", ["materie", "laborator"], "cursul de algebră")
+        self.index = RDNameIndex(None)
+        self.room_name = self.index.add("sală", self.room.get_synonyms())
+        self.course_name = self.index.add("curs", self.course.get_synonyms())
+
+    def test_add(self):
+        other_room = RDConcept.builder(CType.LOCATION, "sală", ["laborator", "cameră"], "113")
+        self.assertEqual(self.index.add("sală", other_room.get_synonyms()),
+                         self.room_name)
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.name_id("curs", ["materie", "laborator"]), self.course_name)
+        self.assertEqual(self.index.name_id("curs", []), -1)
+
+    def test_lookup(self):
+        self.assertSetEqual(self.index.lookup(" Sală"), {self.room_name})
+        self.assertSetEqual(self.index.lookup("laborator"), {self.room_name, self.course_name})
+        self.assertSetEqual(self.index.lookup("materie"), {self.course_name})
+        self.assertSetEqual(self.index.lookup("oră"), set())
+
+    def test_word_net_neighbours(self):
+        word_net = ChainWordNet()
+        index = RDNameIndex(word_net)
+        room_name = index.add("sală", [])
+        index.build(1)
+        self.assertSetEqual(index.lookup("amfiteatru"), {room_name})
+        self.assertSetEqual(index.lookup("încăpere"), {room_name})
+        self.assertSetEqual(index.lookup("spațiu"), set())
+        # The relation is only in the record of the user's word.
+        self.assertSetEqual(index.lookup("aulă"), {room_name})
+        # The answer for a word is memoized.
+        fetched = list(word_net.fetched)
+        self.assertSetEqual(index.lookup("aulă"), {room_name})
+        self.assertListEqual(word_net.fetched, fetched)
+        self.assertSetEqual(index.lookup("spațiu", 2), {room_name})
+
+    def test_max_nodes(self):
+        max_nodes = RDNameIndex.MAX_NODES
+        RDNameIndex.MAX_NODES = 1
+        try:
+            index = RDNameIndex(ChainWordNet())
+            room_name = index.add("sală", [])
+            # The words 1 hop away are never left out.
+            self.assertSetEqual(index.lookup("amfiteatru"), {room_name})
+            self.assertSetEqual(index.lookup("încăpere"), {room_name})
+        finally:
+            RDNameIndex.MAX_NODES = max_nodes
+
+if __name__ == "__main__":
+    unittest.main()
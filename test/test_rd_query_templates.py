@@ -0,0 +1,75 @@
+import os
+import unittest
+
+from ro.racai.robin.dialog.ctype import CType
+from ro.racai.robin.dialog.rd_concept import RDConcept
+from ro.racai.robin.dialog.rd_query_templates import RDQueryTemplates
+from ro.racai.robin.dialog.ro_sayings import RoSayings
+from ro.racai.robin.mw.mw_file_reader import MWFileReader
+from ro.racai.robin.nlp.q_type import QType
+from ro.racai.robin.nlp.ro_lexicon import RoLexicon
+from ro.racai.robin.nlp.ro_text_processor import RoTextProcessor
+from ro.racai.robin.nlp.text_processor import TextProcessor
+
+
+class TestRDQueryTemplates(unittest.TestCase):
+    MW_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "precis.mw")
+
+    def setUp(self) -> None:
+        # The micro-world references and the questions are in the processed text cache.
+        self.text_processor = RoTextProcessor(RoLexicon(), None, RoSayings())
+        self.universe = MWFileReader(TestRDQueryTemplates.MW_FILE).construct_universe(
+            None, RoLexicon(), self.text_processor)
+        self.templates = RDQueryTemplates(self.universe, self.text_processor)
+
+    def assertSameQuery(self, query, expected):
+        self.assertEqual(query.query_type, expected.query_type)
+        self.assertEqual(query.action_verb, expected.action_verb)
+        self.assertEqual(len(query.predicate_arguments), len(expected.predicate_arguments))
+        for arg, expected_arg in zip(query.predicate_arguments, expected.predicate_arguments):
+            self.assertEqual(arg.is_query_variable, expected_arg.is_query_variable)
+            self.assertListEqual([(tok.wform, tok.lemma, tok.POS, tok.is_action_verb_dependent)
+                                  for tok in arg.arg_tokens],
+                                 [(tok.wform, tok.lemma, tok.POS, tok.is_action_verb_dependent)
+                                  for tok in expected_arg.arg_tokens])
+
+    def test_same_as_text_processor(self):
+        for text in ["Unde se ține cursul de sisteme de operare?", "Când se ține cursul de sisteme de operare?",
+                     "Cine ține cursul de sisteme de operare?"]:
+            expected = self.text_processor.query_analyzer(self.text_processor.cached_text_processor(text))
+            self.assertSameQuery(self.templates.match(text), expected)
+
+    def test_learned_verb_forms(self):
+        # "desfășoară" is in the processed text cache.
+        query = self.templates.match("Unde se desfășoară laboratorul de informatică?")
+        self.assertEqual(query.action_verb, "desfășura")
+        self.assertIsNone(self.templates.match("Unde se desfășurau laboratorul de informatică?"))
+        self.templates.learn_verb_forms([TextProcessor.Token("desfășurau", "desfășura", "Vmii3p", 0, "root", False)])
+        query = self.templates.match("Unde se desfășurau laboratorul de informatică?")
+        self.assertEqual(query.action_verb, "desfășura")
+
+    def test_no_diacritics(self):
+        expected = self.templates.match("Când se desfășoară laboratorul de informatică?")
+        query = self.templates.match("Cand se desfasoara laboratorul de informatica?")
+        self.assertEqual(query.query_type, QType.TIME)
+        self.assertEqual(query.predicate_arguments[0].arg_tokens[0].lemma, "când")
+        self.assertListEqual(query.predicate_arguments[1].exact_concepts,
+                             expected.predicate_arguments[1].exact_concepts)
+
+    def test_ambiguous_reference(self):
+        self.assertIsNotNone(self.templates.match("Cine ține 209?"))
+        course = RDConcept.builder(CType.WORD, "curs", [], None)
+        course.set_reference("209", self.text_processor)
+        self.universe.add_concept(course)
+        self.assertIsNone(RDQueryTemplates(self.universe, self.text_processor).match("Cine ține 209?"))
+
+    def test_argument_types(self):
+        # A location is not held somewhere.
+        self.assertIsNone(self.templates.match("Unde se ține 209?"))
+        # Only rooms are taken to.
+        self.assertIsNone(self.templates.match("Unde se duce cursul de algebră?"))
+        self.assertIsNotNone(self.templates.match("Unde se ține cursul de algebră?"))
+
+
+if __name__ == "__main__":
+    unittest.main()
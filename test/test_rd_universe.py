@@ -0,0 +1,187 @@
+import asyncio
+import os
+import unittest
+
+from ro.racai.robin.dialog.rd_universe import RDUniverse
+from ro.racai.robin.mw.mw_file_reader import MWFileReader
+from ro.racai.robin.nlp.ro_lexicon import RoLexicon
+from ro.racai.robin.nlp.ro_text_processor import RoTextProcessor
+from ro.racai.robin.dialog.ro_sayings import RoSayings
+from ro.racai.robin.nlp.word_net import WordNet
+
+
+class SmallWordNet(WordNet):
+    RELATIONS = {
+        "ține": WordNet.Record("ține", ["ține,desfășura"], ["desfășura"], [], []),
+        "desfășura": WordNet.Record("desfășura", ["ține,desfășura"], ["ține"], [], []),
+        "sală": WordNet.Record("sală", ["sală,cameră"], ["cameră"], [], ["laborator"]),
+        "laborator": WordNet.Record("laborator", ["laborator"], [], ["sală"], [])
+    }
+
+    def __init__(self):
+        super().__init__(None, None, None)
+
+    def fetch_record(self, word):
+        return SmallWordNet.RELATIONS.get(word, WordNet.Record(word))
+
+    def get_hypernyms(self, word):
+        return self.get_record(word).hypernyms
+
+    def get_hyponyms(self, word):
+        return self.get_record(word).hyponyms
+
+    def get_synonyms(self, word):
+        return self.get_record(word).synonyms
+
+
+class TestRDUniverse(unittest.TestCase):
+    MW_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "precis.mw")
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The micro-world references are in the processed text cache.
+        cls.word_net = SmallWordNet()
+        cls.text_processor = RoTextProcessor(RoLexicon(), cls.word_net, RoSayings())
+        cls.universe = MWFileReader(TestRDUniverse.MW_FILE).construct_universe(
+            cls.word_net, RoLexicon(), cls.text_processor)
+
+    def query(self, text):
+        return self.text_processor.query_analyzer(self.text_processor.cached_text_processor(text))
+
+    def test_without_word_net(self):
+        universe = MWFileReader(TestRDUniverse.MW_FILE).construct_universe(None, RoLexicon(), self.text_processor)
+        text = "Unde se ține cursul de sisteme de operare?"
+        expected = str(self.universe.resolve_query(self.query(text)).matched_predicate)
+        self.assertEqual(str(universe.resolve_query_top_k(self.query(text), 1)[0].matched_predicate), expected)
+        self.assertEqual(str(asyncio.run(universe.aresolve_query(self.query(text))).matched_predicate), expected)
+        self.assertGreater(universe.resolve_query(self.query("Cine ține cursul?")).match_score, 1.0)
+
+    def test_verb_predicates(self):
+        preds = self.universe.get_universe_predicates()
+        tine = [p for p in preds if p.get_action_verb() == "ține"]
+        self.assertListEqual(self.universe.get_verb_predicates("desfășura"), tine)
+        self.assertListEqual(self.universe.get_verb_predicates("Ține "), tine)
+        self.assertListEqual(self.universe.get_verb_predicates("conduce"),
+                             [p for p in preds if p.get_action_verb() == "duce"])
+        self.assertListEqual(self.universe.get_verb_predicates("mânca"), [])
+
+    def test_candidate_facts(self):
+        preds = self.universe.get_universe_predicates()
+        query = self.query("Unde se ține cursul de sisteme de operare?")
+        self.universe.bind_exact_mentions(query)
+        candidates = self.universe.get_candidate_facts(query)
+        self.assertListEqual([str(preds[k]) for k in candidates],
+                             ["ține('cursul de sisteme de operare'/WORD, 'sala de consiliu'/LOCATION, "
+                              "'joia de la 10:00'/TIME, 'Adriana Vlad'/PERSON)"])
+        # No argument is known exactly and no type is asked for.
+        self.assertIsNone(self.universe.get_candidate_facts(self.text_processor.Query()))
+
+    def test_concept_ids(self):
+        concepts = self.universe.get_universe_concepts()
+        ids = [conc.get_concept_id() for conc in concepts]
+        self.assertNotIn(-1, ids)
+        self.assertEqual(len(set(ids)), len(set(concepts)))
+        copy = concepts[0].deep_copy()
+        self.assertEqual(copy.get_concept_id(), -1)
+        self.assertEqual(copy, concepts[0])
+        self.assertEqual(self.universe.intern_concept(copy), concepts[0].get_concept_id())
+        with self.assertRaises(RuntimeError):
+            copy.set_reference("altceva", self.text_processor)
+        # The ids are given by each universe.
+        other = RDUniverse(None, None, None)
+        other_copy = concepts[1].deep_copy()
+        self.assertEqual(other.intern_concept(other_copy), 0)
+        self.assertNotEqual(other_copy.get_concept_id(), concepts[1].get_concept_id())
+        self.assertEqual(other_copy, concepts[1])
+        with self.assertRaises(RuntimeError):
+            other.intern_concept(concepts[0])
+
+    def test_word_radius(self):
+        self.assertListEqual([RDUniverse.word_radius("x" * n) for n in [0, 2, 7, 8, 11, 12, 19, 20, 30]],
+                             [1, 1, 1, 2, 2, 3, 4, 5, 5])
+        # "cursurile" is 3 edits away from "cursul", over its radius of 2.
+        self.assertNotIn("cursul", self.universe.get_word_neighbours("cursurile"))
+        self.assertDictEqual(self.universe.get_word_neighbours("cursului"), {"cursul": 2})
+
+    def test_word_neighbours(self):
+        self.assertEqual(RDUniverse.word_radius("de"), 1)
+        self.assertEqual(RDUniverse.word_radius("laboratorul"), 2)
+        self.assertDictEqual(self.universe.get_word_neighbours("cursu"), {"cursul": 1})
+        self.assertDictEqual(self.universe.get_word_neighbours("laboratorull"), {"laboratorul": 1})
+        neighbours = self.universe.get_word_neighbours("cursu")
+        self.assertIs(self.universe.get_word_neighbours("cursu"), neighbours)
+        memo_size = RDUniverse.NEIGHBOURS_MEMO_SIZE
+        RDUniverse.NEIGHBOURS_MEMO_SIZE = 1
+        try:
+            self.universe.get_word_neighbours("sala")
+            self.assertIsNot(self.universe.get_word_neighbours("cursu"), neighbours)
+        finally:
+            RDUniverse.NEIGHBOURS_MEMO_SIZE = memo_size
+
+    def test_batch_word_neighbours(self):
+        words = ["laboratorull", "informatica", "matematicaa", "operare", "cursu"]
+        expected = [dict(self.universe.get_word_neighbours(w)) for w in words]
+        batch_min_vocabulary = RDUniverse.BATCH_MIN_VOCABULARY
+        RDUniverse.BATCH_MIN_VOCABULARY = 0
+        try:
+            # A new concept clears the neighbourhoods.
+            self.universe.add_concept(self.universe.get_universe_concepts()[0])
+            self.assertListEqual([self.universe.get_word_neighbours(w) for w in words], expected)
+        finally:
+            RDUniverse.BATCH_MIN_VOCABULARY = batch_min_vocabulary
+
+    def test_resolve_query(self):
+        pm = self.universe.resolve_query(self.query("Unde se ține cursul de sisteme de operare?"))
+        self.assertTrue(pm.is_valid_match)
+        self.assertEqual(str(pm.matched_predicate.get_arguments()[pm.said_argument_index]), "'sala de consiliu'/LOCATION")
+
+    def test_resolve_query_top_k(self):
+        preds = self.universe.get_universe_predicates()
+        top = self.universe.resolve_query_top_k(self.query("Și unde se ține?"), 2)
+        self.assertEqual(len(top), 2)
+        # Equal scores, in the order of the predicates.
+        self.assertEqual(top[0].match_score, top[1].match_score)
+        self.assertLess(preds.index(top[0].matched_predicate), preds.index(top[1].matched_predicate))
+        query = self.query("În ce sală se ține cursul de PLN?")
+        top = self.universe.resolve_query_top_k(query, 3)
+        self.assertListEqual([pm.match_score for pm in top],
+                             sorted([pm.match_score for pm in top], reverse=True))
+        self.assertIs(self.universe.resolve_query(query).matched_predicate, top[0].matched_predicate)
+
+    def test_vector_scoring(self):
+        texts = ["Și unde se ține?", "În ce sală se ține cursul de PLN?", "Cine ține cursul?"]
+        expected = []
+        for text in texts:
+            expected.append([(pm.matched_predicate, pm.match_score, pm.said_argument_index)
+                             for pm in self.universe.resolve_query_top_k(self.query(text), 3)])
+        vector_min_facts = RDUniverse.VECTOR_MIN_FACTS
+        RDUniverse.VECTOR_MIN_FACTS = 0
+        try:
+            for text, top in zip(texts, expected):
+                self.assertListEqual([(pm.matched_predicate, pm.match_score, pm.said_argument_index)
+                                      for pm in self.universe.resolve_query_top_k(self.query(text), 3)], top)
+        finally:
+            RDUniverse.VECTOR_MIN_FACTS = vector_min_facts
+
+    def test_similarity_memo(self):
+        text = "Cine ține cursul?"
+        pm = self.universe.resolve_query(self.query(text))
+        stats = self.universe.similarity_stats()
+        pm_again = self.universe.resolve_query(self.query(text))
+        stats_again = self.universe.similarity_stats()
+        self.assertEqual(pm_again.match_score, pm.match_score)
+        self.assertEqual(stats_again["misses"], stats["misses"])
+        self.assertGreater(stats_again["hits"], stats["hits"])
+        memo_size = RDUniverse.SIMILARITY_MEMO_SIZE
+        RDUniverse.SIMILARITY_MEMO_SIZE = 1
+        try:
+            tokens = self.query(text).predicate_arguments[0].arg_tokens
+            for conc in self.universe.get_universe_concepts()[:2]:
+                self.universe.concept_similarity(conc, tokens)
+            self.assertEqual(self.universe.similarity_stats()["size"], 1)
+        finally:
+            RDUniverse.SIMILARITY_MEMO_SIZE = memo_size
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,13 @@ class TestROSayings(unittest.TestCase):
         words = ['abc', 'b', 'c', 'd']
         self.assertFalse(self.rosayings.user_opening_statement(words))
         self.assertFalse(self.rosayings.user_closing_statement(words))
+        self.assertTrue(self.rosayings.user_opening_statement(['Salut', '!']))
+        self.assertTrue(self.rosayings.user_opening_statement(['Bună', 'ziua', ',', 'Pepper']))
+
+    def test_embedded_statement(self):
+        self.assertTrue(self.rosayings.user_closing_statement(['Mulțumesc', 'frumos']))
+        self.assertTrue(self.rosayings.user_opening_statement(['Salut', 'Pepper', 'ce', 'mai', 'faci']))
+        self.assertFalse(self.rosayings.user_opening_statement(['Unde', 'e', 'sala', '209', 'Pepper']))
 
 
 if __name__ == "__main__":
@@ -10,6 +10,12 @@ class TestStringUtils(unittest.TestCase):
         self.assertTrue(StringUtils.is_none_empty_or_blank(" "))
         self.assertFalse(StringUtils.is_none_empty_or_blank("abc "))
 
+    def test_split_words(self):
+        self.assertListEqual(StringUtils.split_words("Salut, Pepper!"), ["Salut", "Pepper"])
+        self.assertListEqual(StringUtils.split_words("Workshop-ul de marți, 8:00?"),
+                             ["Workshop-ul", "de", "marți", "8:00"])
+        self.assertListEqual(StringUtils.split_words(None), [])
+
 
 if __name__ == "__main__":
     unittest.main()
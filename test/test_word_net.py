@@ -0,0 +1,186 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from ro.racai.robin.nlp.word_net import WordNet
+
+
+class FakeWordNet(WordNet):
+    RELATIONS = {
+        "sală": WordNet.Record("sală", ["sală,cameră"], ["cameră"], ["încăpere"], ["laborator"]),
+        "laborator": WordNet.Record("laborator", ["laborator"], [], ["sală"], []),
+        "încăpere": WordNet.Record("încăpere", ["încăpere"], [], ["spațiu"], ["sală"]),
+        "spațiu": WordNet.Record("spațiu", ["spațiu"], [], [], ["încăpere"])
+    }
+
+    def __init__(self, cache_dir):
+        self.fetches = []
+        super().__init__(None, os.path.join(cache_dir, "wordnet-cache.bin"),
+                         os.path.join(cache_dir, "wordnet-records.txt"))
+
+    def fetch_record(self, word):
+        self.fetches.append(word)
+        if word == "eroare":
+            # A failed lookup.
+            return None
+        return FakeWordNet.RELATIONS.get(word, WordNet.Record(word))
+
+    def get_hypernyms(self, word):
+        return self.get_record(word).hypernyms
+
+    def get_hyponyms(self, word):
+        return self.get_record(word).hyponyms
+
+    def get_synonyms(self, word):
+        return self.get_record(word).synonyms
+
+
+class TestWordNet(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.word_net = FakeWordNet(self.tmp_dir.name)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_one_fetch_per_word(self):
+        self.assertListEqual(self.word_net.get_synonyms("sală"), ["cameră"])
+        self.assertListEqual(self.word_net.get_hypernyms("sală"), ["încăpere"])
+        self.assertListEqual(self.word_net.get_hyponyms("sală"), ["laborator"])
+        self.assertListEqual(self.word_net.fetches, ["sală"])
+
+    def test_word_net_equals(self):
+        self.assertTrue(self.word_net.word_net_equals("sală", "laborator"))
+        self.assertTrue(self.word_net.word_net_equals("laborator", "sală"))
+        self.assertFalse(self.word_net.word_net_equals("sală", "curs"))
+        self.assertListEqual(self.word_net.fetches, ["sală"])
+
+    def test_persisted_records(self):
+        self.word_net.word_net_equals("sală", "laborator")
+        self.word_net.word_net_equals("curs", "sală")
+        self.word_net.dump_word_net_cache()
+        word_net = FakeWordNet(self.tmp_dir.name)
+        self.assertListEqual(word_net.get_synonyms("sală"), ["cameră"])
+        self.assertListEqual(word_net.get_record("sală").senses, ["sală,cameră"])
+        self.assertListEqual(word_net.get_record("curs").synonyms, [])
+        # A new pair, answered from the neighbourhood of "sală".
+        self.assertTrue(word_net.word_net_equals("încăpere", "sală"))
+        self.assertListEqual(word_net.fetches, [])
+
+    def test_persisted_false_pairs(self):
+        self.assertFalse(self.word_net.word_net_equals("spațiu", "sală"))
+        self.assertFalse(self.word_net.word_net_equals("curs", "sală"))
+        self.word_net.dump_word_net_cache()
+        word_net = FakeWordNet(self.tmp_dir.name)
+        word_net._wn_records.clear()
+        self.assertFalse(word_net.word_net_equals("spațiu", "sală"))
+        self.assertListEqual(word_net.fetches, [])
+        # "curs" is not in WordNet: the answer expires with the word.
+        word_net._wn_negative_cache["curs"] = (0, False)
+        self.assertFalse(word_net.word_net_equals("curs", "sală"))
+        self.assertListEqual(word_net.fetches, ["curs"])
+
+    def test_false_pairs_rotation(self):
+        capacity = WordNet.FALSE_PAIRS_CAPACITY
+        WordNet.FALSE_PAIRS_CAPACITY = 1
+        try:
+            word_net = FakeWordNet(self.tmp_dir.name)
+            self.assertFalse(word_net.word_net_equals("spațiu", "sală"))
+            self.assertTrue(word_net._wn_false_pairs.is_full())
+            self.assertFalse(word_net.word_net_equals("spațiu", "laborator"))
+            # The full filter was replaced by an empty one.
+            self.assertNotIn("sală\tspațiu", word_net._wn_false_pairs)
+            self.assertIn("laborator\tspațiu", word_net._wn_false_pairs)
+        finally:
+            WordNet.FALSE_PAIRS_CAPACITY = capacity
+        self.word_net.word_net_equals("spațiu", "sală")
+        self.word_net.dump_word_net_cache()
+        ttl = WordNet.FALSE_PAIRS_TTL
+        WordNet.FALSE_PAIRS_TTL = 0
+        try:
+            # An expired filter is not loaded.
+            word_net = FakeWordNet(self.tmp_dir.name)
+            self.assertEqual(len(word_net._wn_false_pairs), 0)
+        finally:
+            WordNet.FALSE_PAIRS_TTL = ttl
+
+    def test_corrupt_equals_cache(self):
+        self.word_net.word_net_equals("sală", "laborator")
+        self.word_net.dump_word_net_cache()
+        cache_file = os.path.join(self.tmp_dir.name, "wordnet-cache.bin")
+        with open(cache_file, "rb") as rdr:
+            data = rdr.read()
+        for corrupt in [data[:len(data) // 2], data[:5], b"garbage" * 10]:
+            with open(cache_file, "wb") as wrt:
+                wrt.write(corrupt)
+            with self.assertLogs(level="WARNING"):
+                word_net = FakeWordNet(self.tmp_dir.name)
+            self.assertEqual(len(list(word_net._wn_equals_cache.items())), 0)
+
+    def test_corrupt_false_pairs(self):
+        self.word_net.word_net_equals("spațiu", "sală")
+        self.word_net.dump_word_net_cache()
+        false_pairs_file = os.path.join(self.tmp_dir.name, WordNet.FALSE_PAIRS_FILE_NAME)
+        with open(false_pairs_file, "rb") as rdr:
+            data = rdr.read()
+        for corrupt in [data[:len(data) - 1], data[:10], b""]:
+            with open(false_pairs_file, "wb") as wrt:
+                wrt.write(corrupt)
+            with self.assertLogs(level="WARNING"):
+                word_net = FakeWordNet(self.tmp_dir.name)
+            self.assertEqual(len(word_net._wn_false_pairs), 0)
+
+    def test_word_net_distance(self):
+        self.assertEqual(self.word_net.word_net_distance("sală", "sală"), 0)
+        self.assertEqual(self.word_net.word_net_distance("laborator", "sală"), 1)
+        self.assertEqual(self.word_net.word_net_distance("laborator", "încăpere"), 2)
+        self.assertEqual(self.word_net.word_net_distance("laborator", "spațiu", 2), -1)
+        self.assertEqual(self.word_net.word_net_distance("laborator", "spațiu", 3, 1), -1)
+        self.assertEqual(self.word_net.word_net_distance("laborator", "spațiu", 3), 3)
+        fetches = len(self.word_net.fetches)
+        # Memoized, in both directions.
+        self.assertEqual(self.word_net.word_net_distance("încăpere", "laborator"), 2)
+        self.assertEqual(len(self.word_net.fetches), fetches)
+
+    def test_prefetch(self):
+        self.word_net.prefetch(["sală", "laborator", "sală", "", "curs"])
+        self.assertListEqual(sorted(self.word_net.fetches), ["curs", "laborator", "sală"])
+        self.assertTrue(self.word_net.word_net_equals("sală", "laborator"))
+        self.word_net.prefetch(["sală"])
+        self.assertEqual(len(self.word_net.fetches), 3)
+
+    def test_negative_cache(self):
+        self.assertFalse(self.word_net.word_net_equals("curs", "sală"))
+        self.assertFalse(self.word_net.word_net_equals("curs", "laborator"))
+        self.assertListEqual(self.word_net.fetches, ["curs"])
+        self.assertTrue(self.word_net.is_negative_cached("curs"))
+        # Expired information is looked up again.
+        self.word_net._wn_negative_cache["curs"] = (0, False)
+        self.assertListEqual(self.word_net.get_synonyms("curs"), [])
+        self.assertListEqual(self.word_net.fetches, ["curs", "curs"])
+
+    def test_failed_lookup(self):
+        self.assertFalse(self.word_net.word_net_equals("eroare", "sală"))
+        self.assertFalse(self.word_net.word_net_equals("eroare", "sală"))
+        self.assertListEqual(self.word_net.fetches, ["eroare"])
+        self.word_net._wn_negative_cache["eroare"] = (0, True)
+        self.assertFalse(self.word_net.word_net_equals("eroare", "sală"))
+        self.assertListEqual(self.word_net.fetches, ["eroare", "eroare"])
+
+    def test_async_lookups(self):
+        async def lookups():
+            record = await self.word_net.aget_record("sală")
+            answers = await self.word_net.aword_net_equals_many(
+                [("laborator", "sală"), ("curs", "sală"), ("laborator", "curs"), ("sală", "cameră")])
+            return record, answers
+
+        record, answers = asyncio.run(lookups())
+        self.assertListEqual(record.synonyms, ["cameră"])
+        self.assertListEqual(answers, [True, False, False, True])
+        self.assertListEqual(sorted(self.word_net.fetches), ["curs", "laborator", "sală"])
+
+
+if __name__ == "__main__":
+    unittest.main()
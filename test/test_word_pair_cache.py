@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+from ro.racai.robin.nlp.word_pair_cache import WordPairCache
+
+
+class TestWordPairCache(unittest.TestCase):
+
+    def test_unordered_pairs(self):
+        cache = WordPairCache()
+        cache.put("sală", "laborator", True)
+        cache.put("a#b", "c", False)
+        self.assertTrue(cache.get("laborator", "sală"))
+        self.assertFalse(cache.get("c", "a#b"))
+        self.assertIsNone(cache.get("a", "b#c"))
+        self.assertIsNone(cache.get("sală", "curs"))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.key("sală", "laborator"), cache.lookup_key("laborator", "sală"))
+        self.assertEqual(cache.lookup_key("sală", "curs"), -1)
+
+    def test_save_load(self):
+        cache = WordPairCache()
+        cache.put("sală", "laborator", True)
+        cache.put("sală", "curs", False)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_file = os.path.join(tmp_dir, "cache.bin")
+            cache.save(cache_file)
+            loaded = WordPairCache()
+            loaded.intern("încăpere")
+            loaded.load(cache_file)
+        self.assertTrue(loaded.get("laborator", "sală"))
+        self.assertFalse(loaded.get("curs", "sală"))
+        self.assertListEqual(sorted(loaded.items()), sorted(cache.items()))
+
+
+if __name__ == "__main__":
+    unittest.main()